@@ -3,25 +3,59 @@
 from __future__ import annotations
 
 import logging
+import time
+from datetime import timedelta
+from pathlib import Path
 from typing import TYPE_CHECKING
 
 from homeassistant.const import Platform
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
-
-from .api import LUNMistoAirApi
-from .const import SUBENTRY_TYPE_STATION
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.entity_platform import async_get_platforms
+
+from .const import (
+    CONF_EXPORT_CITIES,
+    CONF_EXPORT_FILE,
+    CONF_EXPORT_RETENTION,
+    CONF_MEMORY_TRACING,
+    CONF_RATE_BURST,
+    CONF_RATE_LIMIT,
+    DEFAULT_EXPORT_RETENTION,
+    DEFAULT_RATE_BURST,
+    DEFAULT_RATE_LIMIT,
+    DOMAIN,
+    SIGNAL_SUBENTRY_ADDED,
+    SUBENTRY_TYPE_STATION,
+)
 from .coordinator import LUNMistoAirCoordinator
 from .data import LUNMistoAirConfigEntry, LUNMistoAirRuntimeData
+from .discovery import async_dismiss_configured_stations, async_setup_discovery
+from .export import LUNMistoAirExporter
+from .manager import async_get_manager
+from .memory import async_start_tracing
 from .migrations import migrate_v1_to_v2, migrate_v2_to_v3
+from .services import async_setup_services
+from .views import async_register_views
 
 if TYPE_CHECKING:
-    from homeassistant.config_entries import ConfigEntry
+    from homeassistant.config_entries import ConfigEntry, ConfigSubentry
     from homeassistant.core import HomeAssistant
+    from homeassistant.helpers.typing import ConfigType
+
+    from .manager import LUNMistoAirSnapshotManager
 
 LOGGER = logging.getLogger(__name__)
 
 PLATFORMS = [Platform.SENSOR]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:  # noqa: ARG001
+    """Set up the integration services."""
+    async_setup_services(hass)
+    return True
+
 
 async def async_migrate_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Migrate a single config entry."""
@@ -40,25 +74,63 @@ async def async_migrate_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
 async def async_setup_entry(hass: HomeAssistant, entry: LUNMistoAirConfigEntry) -> bool:
     """Set up a new entry."""
-    api = LUNMistoAirApi(session=async_get_clientsession(hass))
+    start = time.monotonic()
+
+    # The shared manager fetches all stations once for every subentry
+    manager = async_get_manager(hass)
+    manager.api.rate_limiter.configure(
+        rate=entry.options.get(CONF_RATE_LIMIT, DEFAULT_RATE_LIMIT) / 60,
+        burst=int(entry.options.get(CONF_RATE_BURST, DEFAULT_RATE_BURST)),
+    )
+    manager.configure_sources(entry.options)
+    await manager.async_start()
+    entry.async_on_unload(manager.async_stop)
+
+    # Allocations are attributed to integration modules in diagnostics
+    if entry.options.get(CONF_MEMORY_TRACING):
+        entry.async_on_unload(async_start_tracing())
 
     # Initialize runtime_data container
-    entry.runtime_data = LUNMistoAirRuntimeData(api=api)
+    entry.runtime_data = LUNMistoAirRuntimeData(
+        manager=manager,
+        options=dict(entry.options),
+    )
 
     # Create a coordinator for each station subentry
-    for subentry in entry.subentries.values():
-        if subentry.subentry_type != SUBENTRY_TYPE_STATION:
-            continue
-
-        coordinator = LUNMistoAirCoordinator(hass, api, entry, subentry)
+    for subentry in _station_subentries(entry).values():
+        coordinator = LUNMistoAirCoordinator(hass, manager, entry, subentry)
+        entry.runtime_data.coordinators[subentry.subentry_id] = coordinator
         await coordinator.async_config_entry_first_refresh()
 
-        entry.runtime_data.coordinators[subentry.subentry_id] = coordinator
+    # Keep the history of every station outside the recorder
+    if export_file := entry.options.get(CONF_EXPORT_FILE):
+        exporter = entry.runtime_data.exporter = LUNMistoAirExporter(
+            hass,
+            Path(hass.config.path(export_file)),
+            cities=entry.options.get(CONF_EXPORT_CITIES, []),
+            retention=timedelta(
+                days=entry.options.get(CONF_EXPORT_RETENTION, DEFAULT_EXPORT_RETENTION)
+            ),
+        )
+        entry.async_on_unload(exporter.async_start(manager))
+
+    # Serve the snapshot as GeoJSON for map dashboards
+    async_register_views(hass, manager)
+
+    # Propose new stations near home as they appear in the snapshot
+    entry.async_on_unload(async_setup_discovery(hass, entry, manager))
 
     entry.async_on_unload(entry.add_update_listener(async_update_entry))
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    entry.runtime_data.setup_duration = time.monotonic() - start
+    LOGGER.debug(
+        "Set up %d stations in %.3f s",
+        len(entry.runtime_data.coordinators),
+        entry.runtime_data.setup_duration,
+    )
+
     return True
 
 
@@ -67,7 +139,65 @@ async def async_unload_entry(
     entry: LUNMistoAirConfigEntry,
 ) -> bool:
     """Handle removal of an entry."""
-    return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    unloaded = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    if unloaded:
+        for coordinator in entry.runtime_data.coordinators.values():
+            await coordinator.async_shutdown()
+    return unloaded
+
+
+def _station_subentries(entry: LUNMistoAirConfigEntry) -> dict[str, ConfigSubentry]:
+    """Return station subentries keyed by subentry_id."""
+    return {
+        subentry_id: subentry
+        for subentry_id, subentry in entry.subentries.items()
+        if subentry.subentry_type == SUBENTRY_TYPE_STATION
+    }
+
+
+async def _async_remove_subentry_entities(
+    hass: HomeAssistant,
+    entry: LUNMistoAirConfigEntry,
+    subentry_id: str,
+) -> None:
+    """Remove entity objects of a subentry, keeping their registry entries."""
+    for platform in async_get_platforms(hass, DOMAIN):
+        if platform.config_entry is not entry:
+            continue
+        for entity_id, entity in list(platform.entities.items()):
+            registry_entry = entity.registry_entry
+            if registry_entry and registry_entry.config_subentry_id == subentry_id:
+                await platform.async_remove_entity(entity_id)
+
+
+async def _async_add_subentry(
+    hass: HomeAssistant,
+    entry: LUNMistoAirConfigEntry,
+    manager: LUNMistoAirSnapshotManager,
+    subentry: ConfigSubentry,
+) -> bool:
+    """Create the coordinator and entities of a single subentry."""
+    coordinator = LUNMistoAirCoordinator(hass, manager, entry, subentry)
+    entry.runtime_data.coordinators[subentry.subentry_id] = coordinator
+
+    # Resolved from the current snapshot, so no request is made
+    await coordinator.async_refresh()
+
+    # Entities need station data to be created
+    if not coordinator.last_update_success or coordinator.data is None:
+        LOGGER.debug(
+            "Cannot resolve the station of subentry %s: %s",
+            subentry.subentry_id,
+            coordinator.last_exception,
+        )
+        return False
+
+    async_dispatcher_send(
+        hass,
+        SIGNAL_SUBENTRY_ADDED.format(entry_id=entry.entry_id),
+        coordinator,
+    )
+    return True
 
 
 async def async_update_entry(
@@ -75,4 +205,39 @@ async def async_update_entry(
     entry: LUNMistoAirConfigEntry,
 ) -> None:
     """Update a given config entry."""
-    await hass.config_entries.async_reload(entry.entry_id)
+    runtime_data = entry.runtime_data
+
+    # Options affect every station, so reload everything
+    if dict(entry.options) != runtime_data.options:
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+
+    subentries = _station_subentries(entry)
+    coordinators = runtime_data.coordinators
+
+    # Only touch subentries that were removed, added or replaced
+    for subentry_id in list(coordinators):
+        subentry = subentries.get(subentry_id)
+        coordinator = coordinators[subentry_id]
+        if subentry is coordinator.config_subentry:
+            continue
+
+        LOGGER.debug("Removing coordinator of subentry %s", subentry_id)
+        del coordinators[subentry_id]
+        await coordinator.async_shutdown()
+
+        # Entities of removed subentries go away with their registry entries
+        if subentry is not None:
+            await _async_remove_subentry_entities(hass, entry, subentry_id)
+
+    for subentry_id, subentry in subentries.items():
+        if subentry_id in coordinators:
+            continue
+
+        LOGGER.debug("Adding coordinator of subentry %s", subentry_id)
+        if not await _async_add_subentry(hass, entry, runtime_data.manager, subentry):
+            # Setup raises ConfigEntryNotReady and is retried until it resolves
+            await hass.config_entries.async_reload(entry.entry_id)
+            return
+
+    async_dismiss_configured_stations(hass, entry)
@@ -2,10 +2,37 @@
 
 from __future__ import annotations
 
+import asyncio
+import heapq
+import itertools
+import json
+import time
+import weakref
 from dataclasses import dataclass
-from typing import Any, Self
+from enum import IntEnum
+from typing import TYPE_CHECKING, Any, Self
 
-from aiohttp import ClientError, ClientSession, ClientTimeout
+from aiohttp import (
+    ClientError,
+    ClientResponse,
+    ClientSession,
+    ClientTimeout,
+    TraceConfig,
+    hdrs,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from aiohttp.typedefs import JSONDecoder
+
+# Default outbound request budget, shared by every client in the process
+DEFAULT_RATE = 0.1  # requests per second
+DEFAULT_BURST = 3
+
+# Request timeouts on top of the total one
+CONNECT_TIMEOUT = 10  # seconds
+READ_TIMEOUT = 30  # seconds between received chunks
 
 
 class LUNMistoAirError(Exception):
@@ -28,6 +55,155 @@ class LUNMistoAirCityNotFoundError(LUNMistoAirError):
     """Raised when a city is not found."""
 
 
+class LUNMistoAirPriority(IntEnum):
+    """Priority of a request waiting for the rate limiter; lower goes first."""
+
+    REFRESH = 0
+    INTERACTIVE = 1
+
+
+@dataclass(slots=True)
+class LUNMistoAirRateLimiterStats:
+    """Counters of rate limiter queue waits."""
+
+    requests: int = 0
+    queued: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+
+    def record(self, wait: float) -> None:
+        """Account for a granted request."""
+        self.requests += 1
+        if wait > 0:
+            self.queued += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+
+
+class LUNMistoAirRateLimiter:
+    """
+    Token bucket limiting outbound requests.
+
+    Waiting requests are granted tokens in priority order, so scheduled
+    refreshes are served before interactive callers such as config flows.
+    The priority of a task can be raised while it waits.
+    """
+
+    def __init__(self, rate: float = DEFAULT_RATE, burst: int = DEFAULT_BURST) -> None:
+        """Initialize the rate limiter."""
+        self.rate = rate
+        self.burst = burst
+        self.stats = LUNMistoAirRateLimiterStats()
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._waiters: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._sequence = itertools.count()
+        self._wakeup: asyncio.TimerHandle | None = None
+        # Tasks of waiting requests, and priorities raised for whole tasks
+        self._tasks: dict[asyncio.Future[None], asyncio.Task[Any] | None] = {}
+        self._raised: weakref.WeakKeyDictionary[
+            asyncio.Task[Any], LUNMistoAirPriority
+        ] = weakref.WeakKeyDictionary()
+
+    @property
+    def queue_length(self) -> int:
+        """Return the number of requests waiting for a token."""
+        return sum(1 for waiter in self._tasks if not waiter.done())
+
+    def raise_priority(
+        self,
+        task: asyncio.Task[Any],
+        priority: LUNMistoAirPriority,
+    ) -> None:
+        """Serve waiting and later requests of a task at least at a priority."""
+        raised = self._raised.get(task)
+        if task.done() or (raised is not None and raised <= priority):
+            return
+        self._raised[task] = priority
+
+        # The old entry stays in the heap and is skipped once the waiter is done
+        for waiter_priority, _, waiter in list(self._waiters):
+            if (
+                waiter_priority > priority
+                and not waiter.done()
+                and self._tasks.get(waiter) is task
+            ):
+                heapq.heappush(self._waiters, (priority, next(self._sequence), waiter))
+
+    def configure(self, rate: float, burst: int) -> None:
+        """Change the rate (requests per second) and the burst size."""
+        self._refill()
+        self.rate = rate
+        self.burst = burst
+        self._tokens = min(self._tokens, float(burst))
+
+        # Waiters were scheduled for the old rate
+        if self._wakeup is not None:
+            self._wakeup.cancel()
+            self._grant()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            float(self.burst),
+            self._tokens + (now - self._updated) * self.rate,
+        )
+        self._updated = now
+
+    def _grant(self) -> None:
+        """Hand out available tokens to waiters, highest priority first."""
+        self._wakeup = None
+        self._refill()
+
+        while self._waiters and self._tokens >= 1:
+            *_, waiter = heapq.heappop(self._waiters)
+            if waiter.done():
+                continue
+            self._tokens -= 1
+            waiter.set_result(None)
+
+        if self._waiters and self.rate > 0:
+            delay = (1 - self._tokens) / self.rate
+            loop = asyncio.get_running_loop()
+            self._wakeup = loop.call_later(delay, self._grant)
+
+    async def acquire(
+        self,
+        priority: LUNMistoAirPriority = LUNMistoAirPriority.INTERACTIVE,
+    ) -> float:
+        """Wait for a token and return the number of seconds waited."""
+        task = asyncio.current_task()
+        if task is not None and (raised := self._raised.get(task)) is not None:
+            priority = min(priority, raised)
+
+        self._refill()
+        if not self._waiters and self._tokens >= 1:
+            self._tokens -= 1
+            self.stats.record(0)
+            return 0
+
+        start = time.monotonic()
+        waiter = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), waiter))
+        if self._wakeup is None:
+            self._grant()
+
+        # A cancelled waiter stays in the heap and is skipped when popped
+        self._tasks[waiter] = task
+        try:
+            await waiter
+        finally:
+            del self._tasks[waiter]
+
+        wait = time.monotonic() - start
+        self.stats.record(wait)
+        return wait
+
+
+# Shared by every API client in the process
+RATE_LIMITER = LUNMistoAirRateLimiter()
+
+
 @dataclass(slots=True)
 class LUNMistoAirStation:
     """Represents a station."""
@@ -48,21 +224,117 @@ class LUNMistoAirStation:
     @classmethod
     def from_dict(cls: type[Self], data: dict[str, Any]) -> Self:
         """Initialize from a dict."""
-        return cls(
-            name=data["name"],
-            latitude=data["lat"],
-            longitude=data["lng"],
-            city=data["city"],
-            aqi=data["aqi"],
-            avg_pm10=data["avgPm10"],
-            avg_pm25=data["avgPm25"],
-            avg_pm100=data["avgPm100"],
-            updated=data["updated"],
-            temperature=data["temperature"],
-            humidity=data["humidity"],
-            pressure=data["pressure"],
+        return cls(**{field: data[key] for field, key in RECORD_KEYS.items()})
+
+
+# Station fields and the keys of raw /air/stations records they are read from
+RECORD_KEYS: dict[str, str] = {
+    "name": "name",
+    "latitude": "lat",
+    "longitude": "lng",
+    "city": "city",
+    "aqi": "aqi",
+    "avg_pm10": "avgPm10",
+    "avg_pm25": "avgPm25",
+    "avg_pm100": "avgPm100",
+    "updated": "updated",
+    "temperature": "temperature",
+    "humidity": "humidity",
+    "pressure": "pressure",
+}
+
+
+@dataclass(slots=True)
+class LUNMistoAirTransportStats:
+    """Counters of connections and response bytes."""
+
+    connections_created: int = 0
+    connections_reused: int = 0
+    dns_cache_hits: int = 0
+    dns_cache_misses: int = 0
+    responses: int = 0
+    compressed_responses: int = 0
+    wire_bytes: int = 0
+    decoded_bytes: int = 0
+
+    def record_response(self, wire: int, decoded: int, *, compressed: bool) -> None:
+        """Account for a received response body."""
+        self.responses += 1
+        self.compressed_responses += compressed
+        self.wire_bytes += wire
+        self.decoded_bytes += decoded
+
+
+class LUNMistoAirTransport:
+    """
+    HTTP session with connection and byte counters.
+
+    The session comes from the factory, with hooks counting new and reused
+    connections and host lookups. aiohttp negotiates compression and decodes
+    bodies; compressed sizes are taken from Content-Length when the server
+    sends it. A session created without a factory is closed with the
+    transport, one from a factory is only detached.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[..., ClientSession] | None = None,
+        loads: JSONDecoder | None = None,
+    ) -> None:
+        """Initialize the transport."""
+        self.stats = LUNMistoAirTransportStats()
+        self.loads: JSONDecoder = loads or json.loads
+        self.close_session = session_factory is None
+        self.session = (session_factory or ClientSession)(
+            trace_configs=[self._trace_config()],
         )
 
+    def _trace_config(self) -> TraceConfig:
+        """Return hooks counting new and reused connections and DNS lookups."""
+        stats = self.stats
+
+        async def _on_connection_create_end(*_args: Any) -> None:
+            stats.connections_created += 1
+
+        async def _on_connection_reuseconn(*_args: Any) -> None:
+            stats.connections_reused += 1
+
+        async def _on_dns_cache_hit(*_args: Any) -> None:
+            stats.dns_cache_hits += 1
+
+        async def _on_dns_cache_miss(*_args: Any) -> None:
+            stats.dns_cache_misses += 1
+
+        trace_config = TraceConfig()
+        trace_config.on_connection_create_end.append(_on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(_on_connection_reuseconn)
+        trace_config.on_dns_cache_hit.append(_on_dns_cache_hit)
+        trace_config.on_dns_cache_miss.append(_on_dns_cache_miss)
+        return trace_config
+
+    async def read(self, response: ClientResponse) -> bytes:
+        """Return the decoded body of a response."""
+        body = await response.read()
+        encoding = response.headers.get(hdrs.CONTENT_ENCODING, "").lower()
+        compressed = encoding not in ("", "identity")
+        # Chunked responses have no length, so their decoded size is counted
+        wire = response.content_length if compressed else None
+        self.stats.record_response(
+            wire if wire is not None else len(body),
+            len(body),
+            compressed=compressed,
+        )
+        return body
+
+    async def close(self) -> None:
+        """Close the session if we created it, otherwise let go of it."""
+        if self.session.closed:
+            return
+        if self.close_session:
+            await self.session.close()
+        else:
+            self.session.detach()
+
 
 class LUNMistoAirApi:
     """Asynchronous API for LUN Misto Air."""
@@ -71,29 +343,52 @@ class LUNMistoAirApi:
 
     def __init__(
         self,
-        session: ClientSession | None = None,
+        transport: LUNMistoAirTransport | None = None,
         timeout: int = 60,
+        rate_limiter: LUNMistoAirRateLimiter | None = None,
+        base_url: str | None = None,
     ) -> None:
         """Initialize the API."""
-        self.session = session or ClientSession()
-        self.close_session = session is None
-        self.timeout = ClientTimeout(total=timeout)
+        self.transport = transport or LUNMistoAirTransport()
+        self.close_transport = transport is None
+        self.timeout = ClientTimeout(
+            total=timeout,
+            sock_connect=CONNECT_TIMEOUT,
+            sock_read=READ_TIMEOUT,
+        )
+        self.rate_limiter = rate_limiter or RATE_LIMITER
+        if base_url is not None:
+            self.base_url = base_url
+        # Duration of the last request, excluding the rate limiter wait
+        self.last_latency: float | None = None
 
     async def close(self) -> None:
-        """Close the client session if we created it."""
-        if self.close_session and not self.session.closed:
-            await self.session.close()
+        """Close the transport if we created it."""
+        if self.close_transport:
+            await self.transport.close()
 
-    async def _request(self, url: str) -> Any:
+    async def _request(
+        self,
+        url: str,
+        priority: LUNMistoAirPriority = LUNMistoAirPriority.INTERACTIVE,
+    ) -> Any:
         """Make an asynchronous HTTP request."""
+        await self.rate_limiter.acquire(priority)
+        start = time.monotonic()
         try:
-            async with self.session.get(url, timeout=self.timeout) as response:
+            async with self.transport.session.get(
+                url,
+                timeout=self.timeout,
+            ) as response:
+                body = await self.transport.read(response)
                 http_ok = 200
                 if response.status != http_ok:
-                    text = await response.text()
+                    text = body.decode(errors="replace")
                     msg = f"HTTP error {response.status}: {text}"
                     raise LUNMistoAirResponseError(msg)  # noqa: TRY301
-                return await response.json()
+                data = self.transport.loads(body)
+                self.last_latency = time.monotonic() - start
+                return data
         except TimeoutError as err:
             msg = "Request timed out"
             raise LUNMistoAirConnectionError(msg) from err
@@ -104,9 +399,23 @@ class LUNMistoAirApi:
             msg = f"Unexpected error: {err}"
             raise LUNMistoAirError(msg) from err
 
-    async def get_all_stations(self) -> list[LUNMistoAirStation]:
+    async def get_raw_stations(
+        self,
+        priority: LUNMistoAirPriority = LUNMistoAirPriority.INTERACTIVE,
+    ) -> list[dict[str, Any]]:
+        """Fetch and return raw records of all stations."""
+        data = await self._request(self.base_url, priority)
+        if not isinstance(data, list):
+            msg = f"Unexpected response: {type(data).__name__}"
+            raise LUNMistoAirResponseError(msg)
+        return data
+
+    async def get_all_stations(
+        self,
+        priority: LUNMistoAirPriority = LUNMistoAirPriority.INTERACTIVE,
+    ) -> list[LUNMistoAirStation]:
         """Fetch and return data for all stations."""
-        data = await self._request(self.base_url)
+        data = await self.get_raw_stations(priority)
         return [LUNMistoAirStation.from_dict(station) for station in data]
 
     async def get_station_by_name(self, station_name: str) -> LUNMistoAirStation:
@@ -10,36 +10,245 @@ from homeassistant.config_entries import (
     ConfigFlowResult,
     ConfigSubentry,
     ConfigSubentryFlow,
+    OptionsFlow,
     SubentryFlowResult,
 )
-from homeassistant.const import CONF_LATITUDE, CONF_LOCATION, CONF_LONGITUDE, CONF_NAME
+from homeassistant.const import (
+    ATTR_LATITUDE,
+    ATTR_LONGITUDE,
+    CONF_ENTITY_ID,
+    CONF_LATITUDE,
+    CONF_LOCATION,
+    CONF_LONGITUDE,
+    CONF_NAME,
+)
 from homeassistant.core import callback
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.selector import (
+    BooleanSelector,
+    EntitySelector,
+    EntitySelectorConfig,
     LocationSelector,
+    NumberSelector,
+    NumberSelectorConfig,
+    NumberSelectorMode,
     SelectOptionDict,
     SelectSelector,
     SelectSelectorConfig,
+    SelectSelectorMode,
+    TextSelector,
+    TextSelectorConfig,
+    TextSelectorType,
 )
 from homeassistant.util import location
 
-from .api import LUNMistoAirApi, LUNMistoAirStation
+from .api import LUNMistoAirStation
 from .const import (
+    CONF_COMPACT,
+    CONF_DEADBAND,
+    CONF_DISCOVERY_RADIUS,
+    CONF_ERROR_THRESHOLD,
+    CONF_EXPORT_CITIES,
+    CONF_EXPORT_FILE,
+    CONF_EXPORT_RETENTION,
+    CONF_LATENCY_THRESHOLD,
+    CONF_MEMORY_TRACING,
+    CONF_MIRROR_URL,
+    CONF_RATE_BURST,
+    CONF_RATE_LIMIT,
+    CONF_RECORD_FILE,
+    CONF_REPLAY_FILE,
+    CONF_REPLAY_SPEED,
+    CONF_SENSORS,
+    CONF_SOURCE_FILE,
     CONF_STATION_NAME,
     CONF_STATION_TYPE,
+    CONF_UPDATE_INTERVAL,
+    DEADBAND_KEY_FORMAT,
+    DEFAULT_DISCOVERY_RADIUS,
+    DEFAULT_ERROR_THRESHOLD,
+    DEFAULT_EXPORT_RETENTION,
+    DEFAULT_LATENCY_THRESHOLD,
+    DEFAULT_RATE_BURST,
+    DEFAULT_RATE_LIMIT,
+    DEFAULT_REPLAY_SPEED,
     DOMAIN,
     LUN_MISTO_AIR_URL,
+    MAX_DISCOVERY_RADIUS,
+    MAX_REPLAY_SPEED,
+    MAX_UPDATE_INTERVAL,
+    MIN_UPDATE_INTERVAL,
     NAME,
     STATION_NAME_FORMAT,
     STATION_TYPE_DYNAMIC,
     STATION_TYPE_STATIC,
     SUBENTRY_TYPE_STATION,
+    UPDATE_INTERVAL,
 )
+from .manager import async_get_manager
+from .sensor import SENSOR_TYPES
 
 LOGGER = logging.getLogger(__name__)
 
 STEP_MAP = "map"
 STEP_STATION_NAME = "station_name"
+STEP_ENTITY = "entity"
+STEP_RECONFIGURE = "reconfigure"
+
+RECONFIGURE_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_COMPACT, default=False): BooleanSelector(),
+        vol.Required(CONF_SENSORS): SelectSelector(
+            SelectSelectorConfig(
+                options=[description.key for description in SENSOR_TYPES],
+                multiple=True,
+                mode=SelectSelectorMode.LIST,
+                translation_key="sensor_type",
+            ),
+        ),
+        vol.Required(CONF_DEADBAND, default=True): BooleanSelector(),
+        # Thresholds of readings with a deadband; relative ones are in percent
+        **{
+            vol.Required(
+                DEADBAND_KEY_FORMAT.format(key=description.key),
+                default=description.deadband.display_value,
+            ): NumberSelector(
+                NumberSelectorConfig(
+                    min=0,
+                    max=100,
+                    step=0.1,
+                    unit_of_measurement=(
+                        "%"
+                        if description.deadband.relative
+                        else description.native_unit_of_measurement
+                    ),
+                    mode=NumberSelectorMode.BOX,
+                ),
+            )
+            for description in SENSOR_TYPES
+            if description.deadband is not None
+        },
+        vol.Required(
+            CONF_UPDATE_INTERVAL,
+            default=UPDATE_INTERVAL,
+        ): NumberSelector(
+            NumberSelectorConfig(
+                min=MIN_UPDATE_INTERVAL,
+                max=MAX_UPDATE_INTERVAL,
+                step=1,
+                unit_of_measurement="min",
+                mode=NumberSelectorMode.BOX,
+            ),
+        ),
+    },
+)
+
+# Optional options that are cleared by leaving them empty
+OPTIONAL_KEYS = (
+    CONF_MIRROR_URL,
+    CONF_SOURCE_FILE,
+    CONF_RECORD_FILE,
+    CONF_REPLAY_FILE,
+    CONF_EXPORT_FILE,
+    CONF_EXPORT_CITIES,
+)
+
+OPTIONS_SCHEMA = vol.Schema(
+    {
+        vol.Required(
+            CONF_DISCOVERY_RADIUS,
+            default=DEFAULT_DISCOVERY_RADIUS,
+        ): NumberSelector(
+            NumberSelectorConfig(
+                min=0,
+                max=MAX_DISCOVERY_RADIUS,
+                step=1,
+                unit_of_measurement="km",
+                mode=NumberSelectorMode.BOX,
+            ),
+        ),
+        vol.Required(
+            CONF_RATE_LIMIT,
+            default=DEFAULT_RATE_LIMIT,
+        ): NumberSelector(
+            NumberSelectorConfig(
+                min=1,
+                max=60,
+                step=1,
+                unit_of_measurement="req/min",
+                mode=NumberSelectorMode.BOX,
+            ),
+        ),
+        vol.Required(
+            CONF_RATE_BURST,
+            default=DEFAULT_RATE_BURST,
+        ): NumberSelector(
+            NumberSelectorConfig(
+                min=1,
+                max=10,
+                step=1,
+                mode=NumberSelectorMode.BOX,
+            ),
+        ),
+        vol.Optional(CONF_MIRROR_URL): TextSelector(
+            TextSelectorConfig(type=TextSelectorType.URL),
+        ),
+        vol.Optional(CONF_SOURCE_FILE): TextSelector(),
+        vol.Required(
+            CONF_LATENCY_THRESHOLD,
+            default=DEFAULT_LATENCY_THRESHOLD,
+        ): NumberSelector(
+            NumberSelectorConfig(
+                min=1,
+                max=60,
+                step=1,
+                unit_of_measurement="s",
+                mode=NumberSelectorMode.BOX,
+            ),
+        ),
+        vol.Required(
+            CONF_ERROR_THRESHOLD,
+            default=DEFAULT_ERROR_THRESHOLD,
+        ): NumberSelector(
+            NumberSelectorConfig(
+                min=1,
+                max=10,
+                step=1,
+                mode=NumberSelectorMode.BOX,
+            ),
+        ),
+        vol.Optional(CONF_RECORD_FILE): TextSelector(),
+        vol.Optional(CONF_REPLAY_FILE): TextSelector(),
+        vol.Required(
+            CONF_REPLAY_SPEED,
+            default=DEFAULT_REPLAY_SPEED,
+        ): NumberSelector(
+            NumberSelectorConfig(
+                min=1,
+                max=MAX_REPLAY_SPEED,
+                step=1,
+                unit_of_measurement="x",
+                mode=NumberSelectorMode.BOX,
+            ),
+        ),
+        vol.Optional(CONF_EXPORT_FILE): TextSelector(),
+        vol.Optional(CONF_EXPORT_CITIES): TextSelector(
+            TextSelectorConfig(multiple=True),
+        ),
+        vol.Required(
+            CONF_EXPORT_RETENTION,
+            default=DEFAULT_EXPORT_RETENTION,
+        ): NumberSelector(
+            NumberSelectorConfig(
+                min=1,
+                max=3650,
+                step=1,
+                unit_of_measurement="d",
+                mode=NumberSelectorMode.BOX,
+            ),
+        ),
+        vol.Required(CONF_MEMORY_TRACING, default=False): BooleanSelector(),
+    },
+)
 
 
 def distance_to_station(lat: float, lon: float, station: LUNMistoAirStation) -> float:
@@ -94,6 +303,14 @@ class LUNMistoAirConfigFlow(ConfigFlow, domain=DOMAIN):
         """Return subentries supported by this handler."""
         return {SUBENTRY_TYPE_STATION: StationFlowHandler}
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: ConfigEntry,  # noqa: ARG004
+    ) -> OptionsFlow:
+        """Create the options flow."""
+        return LUNMistoAirOptionsFlow()
+
     async def async_step_user(
         self,
         user_input: dict[str, Any] | None = None,  # noqa: ARG002
@@ -110,6 +327,31 @@ class LUNMistoAirConfigFlow(ConfigFlow, domain=DOMAIN):
         )
 
 
+class LUNMistoAirOptionsFlow(OptionsFlow):
+    """Handle integration-wide options."""
+
+    async def async_step_init(
+        self,
+        user_input: dict[str, Any] | None = None,
+    ) -> ConfigFlowResult:
+        """Manage the options."""
+        if user_input is not None:
+            options = {**self.config_entry.options, **user_input}
+            # Cleared optional fields are missing from the input altogether
+            for key in OPTIONAL_KEYS:
+                if key not in user_input:
+                    options.pop(key, None)
+            return self.async_create_entry(data=options)
+
+        return self.async_show_form(
+            step_id="init",
+            data_schema=self.add_suggested_values_to_schema(
+                OPTIONS_SCHEMA,
+                self.config_entry.options,
+            ),
+        )
+
+
 class StationFlowHandler(ConfigSubentryFlow):
     """Handle subentry flow for adding stations."""
 
@@ -120,7 +362,7 @@ class StationFlowHandler(ConfigSubentryFlow):
         """User flow to create a sensor subentry."""
         return self.async_show_menu(
             step_id="user",
-            menu_options=["map", "station_name"],
+            menu_options=["map", "entity", "station_name"],
         )
 
     async def async_step_map(
@@ -177,6 +419,55 @@ class StationFlowHandler(ConfigSubentryFlow):
             errors=errors,
         )
 
+    async def async_step_entity(
+        self,
+        user_input: dict[str, Any] | None = None,
+    ) -> SubentryFlowResult:
+        """Follow the location of a person or a device tracker."""
+        if user_input is not None:
+            name = user_input[CONF_NAME]
+            entity_id = user_input[CONF_ENTITY_ID]
+
+            for entry in self.hass.config_entries.async_entries(DOMAIN):
+                for subentry in entry.subentries.values():
+                    if is_dynamic_station_with_name(subentry, name):
+                        return self.async_abort(reason="already_configured")
+
+            # Used until the entity reports a location
+            state = self.hass.states.get(entity_id)
+            attributes = state.attributes if state else {}
+            latitude = attributes.get(ATTR_LATITUDE, self.hass.config.latitude)
+            longitude = attributes.get(ATTR_LONGITUDE, self.hass.config.longitude)
+
+            LOGGER.debug(
+                "Creating tracked station entry: name=%s, entity=%s",
+                name,
+                entity_id,
+            )
+
+            return self.async_create_entry(
+                title=name,
+                data={
+                    CONF_NAME: name,
+                    CONF_STATION_TYPE: STATION_TYPE_DYNAMIC,
+                    CONF_ENTITY_ID: entity_id,
+                    CONF_LATITUDE: latitude,
+                    CONF_LONGITUDE: longitude,
+                },
+            )
+
+        return self.async_show_form(
+            step_id=STEP_ENTITY,
+            data_schema=vol.Schema(
+                {
+                    vol.Required(CONF_NAME): str,
+                    vol.Required(CONF_ENTITY_ID): EntitySelector(
+                        EntitySelectorConfig(domain=["person", "device_tracker"]),
+                    ),
+                },
+            ),
+        )
+
     async def async_step_station_name(
         self,
         user_input: dict[str, Any] | None = None,
@@ -192,8 +483,8 @@ class StationFlowHandler(ConfigSubentryFlow):
                     if is_static_station_with_name(subentry, station_name):
                         return self.async_abort(reason="already_configured")
 
-            api = LUNMistoAirApi(session=async_get_clientsession(self.hass))
-            station = await api.get_station_by_name(station_name)
+            manager = async_get_manager(self.hass)
+            station = await manager.async_get_station(station_name)
 
             # Use custom name if provided, otherwise format default name
             name = desired_name or STATION_NAME_FORMAT.format(
@@ -216,8 +507,8 @@ class StationFlowHandler(ConfigSubentryFlow):
                 },
             )
 
-        api = LUNMistoAirApi(session=async_get_clientsession(self.hass))
-        stations = await api.get_all_stations()
+        manager = async_get_manager(self.hass)
+        stations = list((await manager.async_get_stations()).scan())
 
         return self.async_show_form(
             step_id=STEP_STATION_NAME,
@@ -236,3 +527,34 @@ class StationFlowHandler(ConfigSubentryFlow):
             ),
             description_placeholders={"lun_url": LUN_MISTO_AIR_URL},
         )
+
+    async def async_step_reconfigure(
+        self,
+        user_input: dict[str, Any] | None = None,
+    ) -> SubentryFlowResult:
+        """Choose the sensors of a station and how they are exposed."""
+        errors: dict[str, str] = {}
+        subentry = self._get_reconfigure_subentry()
+
+        if user_input is not None:
+            if not user_input[CONF_SENSORS]:
+                errors["base"] = "no_sensors"
+            else:
+                return self.async_update_and_abort(
+                    self._get_entry(),
+                    subentry,
+                    data_updates=user_input,
+                )
+
+        return self.async_show_form(
+            step_id=STEP_RECONFIGURE,
+            data_schema=self.add_suggested_values_to_schema(
+                RECONFIGURE_SCHEMA,
+                {
+                    CONF_SENSORS: [description.key for description in SENSOR_TYPES],
+                    **subentry.data,
+                    **(user_input or {}),
+                },
+            ),
+            errors=errors,
+        )
@@ -9,6 +9,24 @@ LUN_MISTO_AIR_URL: Final = "https://misto.lun.ua/air"
 # Configuration options
 CONF_STATION_NAME: Final = "station_name"
 CONF_STATION_TYPE: Final = "station_type"
+CONF_DISCOVERY_RADIUS: Final = "discovery_radius"
+CONF_RATE_LIMIT: Final = "rate_limit"
+CONF_RATE_BURST: Final = "rate_burst"
+CONF_COMPACT: Final = "compact"
+CONF_SENSORS: Final = "sensors"
+CONF_DEADBAND: Final = "deadband"
+CONF_UPDATE_INTERVAL: Final = "update_interval"
+CONF_MEMORY_TRACING: Final = "memory_tracing"
+CONF_MIRROR_URL: Final = "mirror_url"
+CONF_SOURCE_FILE: Final = "source_file"
+CONF_LATENCY_THRESHOLD: Final = "latency_threshold"
+CONF_ERROR_THRESHOLD: Final = "error_threshold"
+CONF_RECORD_FILE: Final = "record_file"
+CONF_REPLAY_FILE: Final = "replay_file"
+CONF_REPLAY_SPEED: Final = "replay_speed"
+CONF_EXPORT_FILE: Final = "export_file"
+CONF_EXPORT_CITIES: Final = "export_cities"
+CONF_EXPORT_RETENTION: Final = "export_retention"
 
 # Station types
 STATION_TYPE_STATIC: Final = "static"
@@ -19,15 +37,49 @@ SUBENTRY_TYPE_STATION: Final = "station"
 
 # Format strings
 STATION_NAME_FORMAT: Final = "{city} ({station})"
+DEADBAND_KEY_FORMAT: Final = "deadband_{key}"
 
 # Attributes
 ATTR_STATION_NAME: Final = "station_name"
 ATTR_CITY: Final = "city"
 ATTR_UPDATED: Final = "updated"
+ATTR_STALE: Final = "stale"
+
+# Services
+SERVICE_PROFILE: Final = "profile"
+ATTR_CYCLES: Final = "cycles"
+ATTR_FILE: Final = "file"
+
+# Repair issues
+ISSUE_NEW_STATION: Final = "new_station"
+
+# Dispatcher signals
+SIGNAL_SUBENTRY_ADDED: Final = f"{DOMAIN}_subentry_added_{{entry_id}}"
+
+# Events
+EVENT_SNAPSHOT_DIFF: Final = f"{DOMAIN}_snapshot_diff"
 
 # Consts
 UPDATE_INTERVAL: Final = 10
+MIN_UPDATE_INTERVAL: Final = 1
+MAX_UPDATE_INTERVAL: Final = 60
 SUGGESTED_PRECISION: Final = 3
+DEFAULT_DISCOVERY_RADIUS: Final = 5  # km, 0 disables discovery
+MAX_DISCOVERY_RADIUS: Final = 100
+DEFAULT_RATE_LIMIT: Final = 6  # requests per minute
+DEFAULT_RATE_BURST: Final = 3
+DEFAULT_LATENCY_THRESHOLD: Final = 10  # seconds
+DEFAULT_ERROR_THRESHOLD: Final = 3  # consecutive errors
+DEFAULT_REPLAY_SPEED: Final = 1
+MAX_REPLAY_SPEED: Final = 1000
+DEFAULT_EXPORT_RETENTION: Final = 365  # days
+DEFAULT_PROFILE_CYCLES: Final = 3
+MAX_PROFILE_CYCLES: Final = 50
+DEFAULT_PROFILE_FILE: Final = f"{DOMAIN}_profile.json"
+TRACKER_COOLDOWN: Final = 60  # seconds between nearest station lookups
+TRACKER_MIN_DISTANCE: Final = 250  # meters moved before looking up again
+DEADBAND_MAX_QUIET: Final = 60  # minutes without a state write despite deadbands
+STALE_AFTER: Final = 180  # minutes without a new reading before a station is stale
 
 # Plausible ranges used to detect offline/erroneous sensor readings.
 # The API reports 0 (or physically impossible values) when a sensor is
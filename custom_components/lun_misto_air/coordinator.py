@@ -1,33 +1,109 @@
 """Coordinator for LUN Misto Air integration."""
 
+from __future__ import annotations
+
 import logging
-from datetime import timedelta
+import time
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING
 
-from homeassistant.config_entries import ConfigEntry, ConfigSubentry
-from homeassistant.const import CONF_LATITUDE, CONF_LONGITUDE
-from homeassistant.core import HomeAssistant
+from homeassistant.const import (
+    ATTR_LATITUDE,
+    ATTR_LONGITUDE,
+    CONF_ENTITY_ID,
+    CONF_LATITUDE,
+    CONF_LONGITUDE,
+)
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, State, callback
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.event import (
+    async_call_later,
+    async_track_state_change_event,
+)
 from homeassistant.helpers.update_coordinator import (
     DataUpdateCoordinator,
     UpdateFailed,
 )
-from homeassistant.util import location
+from homeassistant.util import location as location_util
 
-from .api import (
-    LUNMistoAirApi,
-    LUNMistoAirError,
-    LUNMistoAirStation,
-    LUNMistoAirStationNotFoundError,
-)
+from .api import LUNMistoAirError, LUNMistoAirPriority, LUNMistoAirStation
 from .const import (
     CONF_STATION_NAME,
     CONF_STATION_TYPE,
+    CONF_UPDATE_INTERVAL,
     DOMAIN,
     STATION_TYPE_DYNAMIC,
+    TRACKER_COOLDOWN,
+    TRACKER_MIN_DISTANCE,
     UPDATE_INTERVAL,
 )
+from .health import ONLINE, LUNMistoAirHealth
+from .profiling import STAGE_DIFF, profile_stage
+from .snapshot import LUNMistoAirSnapshot, LUNMistoAirSnapshotDiff, diff_snapshots
+
+if TYPE_CHECKING:
+    from homeassistant.config_entries import ConfigEntry, ConfigSubentry
+    from homeassistant.core import Event, EventStateChangedData
+
+    from .manager import LUNMistoAirSnapshotManager
 
 LOGGER = logging.getLogger(__name__)
 
+type _Location = tuple[float, float]
+
+# Snapshots arriving this early are still delivered to slower subscribers
+DUE_TOLERANCE = 30  # seconds
+
+
+def _state_location(state: State | None) -> _Location | None:
+    """Return coordinates reported by a person or device tracker state."""
+    if state is None:
+        return None
+    latitude = state.attributes.get(ATTR_LATITUDE)
+    longitude = state.attributes.get(ATTR_LONGITUDE)
+    if latitude is None or longitude is None:
+        return None
+    return (latitude, longitude)
+
+
+class LUNMistoAirSnapshotCoordinator(DataUpdateCoordinator[LUNMistoAirSnapshot]):
+    """Refresh schedule of the shared snapshot of all stations."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        manager: LUNMistoAirSnapshotManager,
+    ) -> None:
+        """Initialize the coordinator."""
+        # Shared by all config entries, flows and migrations, so no config entry
+        super().__init__(
+            hass,
+            LOGGER,
+            config_entry=None,
+            name=f"{DOMAIN}_snapshot",
+            update_interval=timedelta(minutes=UPDATE_INTERVAL),
+        )
+        self._manager = manager
+        self.diff = LUNMistoAirSnapshotDiff()
+
+    async def _async_update_data(self) -> LUNMistoAirSnapshot:
+        if (profiler := self._manager.profiler) is not None:
+            profiler.start_cycle()
+        try:
+            current = await self._manager.async_fetch(LUNMistoAirPriority.REFRESH)
+        except LUNMistoAirError as exc:
+            msg = f"Error fetching data: {exc}"
+            raise UpdateFailed(msg) from exc
+
+        # Replayed responses are refreshed at their recorded pace
+        self.update_interval = (
+            self._manager.source.next_interval or self._manager.refresh_interval
+        )
+
+        with profile_stage(profiler, STAGE_DIFF):
+            self.diff = diff_snapshots(self.data, current)
+        return current
+
 
 class LUNMistoAirCoordinator(DataUpdateCoordinator[LUNMistoAirStation]):
     """The LUN Misto Air data update coordinator."""
@@ -39,53 +115,253 @@ class LUNMistoAirCoordinator(DataUpdateCoordinator[LUNMistoAirStation]):
     def __init__(
         self,
         hass: HomeAssistant,
-        api: LUNMistoAirApi,
+        manager: LUNMistoAirSnapshotManager,
         config_entry: ConfigEntry,
         config_subentry: ConfigSubentry,
     ) -> None:
         """Initialize the coordinator."""
+        # Updates are pushed by the snapshot manager, so no own polling
         super().__init__(
             hass,
             LOGGER,
+            config_entry=config_entry,
             name=DOMAIN,
-            update_interval=timedelta(minutes=UPDATE_INTERVAL),
+            update_interval=None,
         )
         self.hass = hass
-        self._api = api
+        self._manager = manager
+        self._snapshot_coordinator = manager.coordinator
+        self.refresh_stats = manager.refresh_stats
         self.config_entry = config_entry
         self.config_subentry = config_subentry
         self.station_name = self.config_subentry.data.get(CONF_STATION_NAME, "")
+        self._subscribed_station: str | None = None
+        self._unsub_station: CALLBACK_TYPE | None = None
+        self._unsub_topology: CALLBACK_TYPE | None = None
+        self._unsub_tracker: CALLBACK_TYPE | None = None
+        self._location: _Location | None = None
+        self._pending_location: _Location | None = None
+        self._delivered_at = 0.0
+        self._unsub_due: CALLBACK_TYPE | None = None
+        # Health of the delivered station, as classified with its snapshot
+        self.health = LUNMistoAirHealth.NONE
+
+        # Subscribers slower than the shared schedule skip snapshots until due
+        self.refresh_interval = timedelta(
+            minutes=config_subentry.data.get(CONF_UPDATE_INTERVAL, UPDATE_INTERVAL)
+        )
+        self._unsub_interval: CALLBACK_TYPE | None = manager.async_add_refresh_interval(
+            self.refresh_interval
+        )
 
-    def _distance_to_station(self, st: LUNMistoAirStation) -> float:
-        latitude = self.config_subentry.data[CONF_LATITUDE]
-        longitude = self.config_subentry.data[CONF_LONGITUDE]
-        dist = location.distance(latitude, longitude, st.latitude, st.longitude)
-        return dist if dist is not None else float("inf")
+        if self.is_dynamic:
+            self._unsub_topology = manager.dispatcher.async_add_topology_listener(
+                self._async_handle_snapshot_update,
+            )
+            self._location = (
+                config_subentry.data[CONF_LATITUDE],
+                config_subentry.data[CONF_LONGITUDE],
+            )
 
-    async def _fetch_static_station(self) -> LUNMistoAirStation:
-        """Fetch data for a static station by name."""
-        return await self._api.get_station_by_name(self.station_name)
+        if self.tracked_entity_id:
+            self._location = (
+                _state_location(hass.states.get(self.tracked_entity_id))
+                or self._location
+            )
+            # Coalesce bursts of location updates into one lookup per cooldown
+            self._location_debouncer = Debouncer(
+                hass,
+                LOGGER,
+                cooldown=TRACKER_COOLDOWN,
+                immediate=False,
+                function=self._async_apply_location,
+            )
+            self._unsub_tracker = async_track_state_change_event(
+                hass,
+                self.tracked_entity_id,
+                self._async_handle_tracker_event,
+            )
 
-    async def _fetch_dynamic_station(self) -> LUNMistoAirStation:
-        """Fetch data for the nearest station based on stored coordinates."""
-        stations = await self._api.get_all_stations()
-        if not stations:
+    @property
+    def is_dynamic(self) -> bool:
+        """Return True if the station is resolved by location."""
+        return self.config_subentry.data.get(CONF_STATION_TYPE) == STATION_TYPE_DYNAMIC
+
+    def _resolve_static_station(
+        self,
+        snapshot: LUNMistoAirSnapshot,
+    ) -> LUNMistoAirStation:
+        """Find a static station by name."""
+        if (station := snapshot.stations.get(self.station_name)) is None:
+            msg = f"Station '{self.station_name}' not found"
+            raise UpdateFailed(msg)
+        return station
+
+    @property
+    def tracked_entity_id(self) -> str | None:
+        """Return the person or device tracker the station follows."""
+        return self.config_subentry.data.get(CONF_ENTITY_ID)
+
+    @property
+    def location(self) -> _Location | None:
+        """Return the point the nearest station is resolved for."""
+        return self._location
+
+    def _resolve_dynamic_station(
+        self,
+        snapshot: LUNMistoAirSnapshot,
+    ) -> LUNMistoAirStation:
+        """Find the nearest station to the stored or tracked coordinates."""
+        if self._location is None:
+            msg = "No location to find the nearest station for"
+            raise UpdateFailed(msg)
+        # Offline and stale stations are only picked when nothing else is left
+        point = snapshot.index.nearest(
+            *self._location,
+            accept=lambda point: ONLINE in snapshot.health[point.name],
+        ) or snapshot.index.nearest(*self._location)
+        if point is None:
             msg = "No stations found"
             raise UpdateFailed(msg)
+        return snapshot.stations[point.name]
 
-        return min(stations, key=self._distance_to_station)
+    def _resolve_station(self) -> tuple[LUNMistoAirStation, LUNMistoAirHealth]:
+        """Resolve the tracked station and its health from the latest snapshot."""
+        snapshot = self._snapshot_coordinator.data
+        if not self._snapshot_coordinator.last_update_success or snapshot is None:
+            msg = f"Error fetching data: {self._snapshot_coordinator.last_exception}"
+            raise UpdateFailed(msg)
+
+        if self.is_dynamic:
+            station = self._resolve_dynamic_station(snapshot)
+            self._async_subscribe(station.name)
+        else:
+            self._async_subscribe(self.station_name)
+            station = self._resolve_static_station(snapshot)
+        return station, snapshot.health[station.name]
+
+    @callback
+    def _async_subscribe(self, station_name: str) -> None:
+        """Listen for changes of the given station only."""
+        if station_name == self._subscribed_station:
+            return
+
+        if self._unsub_station:
+            self._unsub_station()
+
+        self._subscribed_station = station_name
+        self._unsub_station = self._manager.dispatcher.async_add_listener(
+            station_name,
+            self._async_handle_snapshot_update,
+        )
+
+    @callback
+    def _async_handle_snapshot_update(self) -> None:
+        """Handle a change of the tracked station in the snapshot."""
+        # Errors are reported right away, readings once the interval is due
+        if self._snapshot_coordinator.last_update_success and self.data is not None:
+            due_in = (
+                self._delivered_at
+                + self.refresh_interval.total_seconds()
+                - time.monotonic()
+            )
+            if due_in > DUE_TOLERANCE:
+                if self._unsub_due is None:
+                    self._unsub_due = async_call_later(
+                        self.hass,
+                        due_in,
+                        self._async_handle_due,
+                    )
+                return
+
+        self._async_deliver()
+
+    @callback
+    def _async_handle_due(self, _now: datetime) -> None:
+        """Deliver a change held back until the refresh interval was due."""
+        self._unsub_due = None
+        self._async_deliver()
+
+    @callback
+    def _async_deliver(self) -> None:
+        """Push the tracked station from the latest snapshot."""
+        if self._unsub_due:
+            self._unsub_due()
+            self._unsub_due = None
 
-    async def _async_update_data(self) -> LUNMistoAirStation:
         try:
-            station_type = self.config_subentry.data.get(CONF_STATION_TYPE)
+            station, self.health = self._resolve_station()
+        except UpdateFailed as exc:
+            self.async_set_update_error(exc)
+            return
 
-            if station_type == STATION_TYPE_DYNAMIC:
-                return await self._fetch_dynamic_station()
+        self._delivered_at = time.monotonic()
+        self.async_set_updated_data(station)
 
-            return await self._fetch_static_station()
-        except LUNMistoAirStationNotFoundError as exc:
-            msg = f"Station '{self.station_name}' not found"
-            raise UpdateFailed(msg) from exc
-        except LUNMistoAirError as exc:
-            msg = f"Error fetching data: {exc}"
-            raise UpdateFailed(msg) from exc
+    @callback
+    def _async_handle_tracker_event(
+        self,
+        event: Event[EventStateChangedData],
+    ) -> None:
+        """Queue a lookup for the latest location of the tracked entity."""
+        if (location := _state_location(event.data["new_state"])) is None:
+            return
+        self._pending_location = location
+        self._location_debouncer.async_schedule_call()
+
+    @callback
+    def _async_apply_location(self) -> None:
+        """Resolve the nearest station once the tracked entity moved enough."""
+        location, self._pending_location = self._pending_location, None
+        if location is None:
+            return
+
+        if self._location is not None:
+            distance = location_util.distance(*self._location, *location)
+            if distance is not None and distance < TRACKER_MIN_DISTANCE:
+                return
+        self._location = location
+
+        if self._snapshot_coordinator.data is None:
+            return
+        try:
+            station, health = self._resolve_station()
+        except UpdateFailed as exc:
+            self.async_set_update_error(exc)
+            return
+
+        # Readings of the same station are pushed by the snapshot as usual
+        if self.data is None or station.name != self.data.name:
+            LOGGER.debug(
+                "%s moved, nearest station is now %s",
+                self.tracked_entity_id,
+                station.name,
+            )
+            self.health = health
+            self.async_set_updated_data(station)
+
+    async def _async_update_data(self) -> LUNMistoAirStation:
+        station, self.health = self._resolve_station()
+        self._delivered_at = time.monotonic()
+        return station
+
+    async def async_shutdown(self) -> None:
+        """Stop listening to the snapshot manager."""
+        await super().async_shutdown()
+        if self._unsub_interval:
+            self._unsub_interval()
+            self._unsub_interval = None
+        if self._unsub_due:
+            self._unsub_due()
+            self._unsub_due = None
+        if self._unsub_station:
+            self._unsub_station()
+            self._unsub_station = None
+            self._subscribed_station = None
+        if self._unsub_topology:
+            self._unsub_topology()
+            self._unsub_topology = None
+        if self._unsub_tracker:
+            self._unsub_tracker()
+            self._unsub_tracker = None
+            self._location_debouncer.async_shutdown()
@@ -3,13 +3,14 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from homeassistant.config_entries import ConfigEntry
 
 if TYPE_CHECKING:
-    from .api import LUNMistoAirApi
     from .coordinator import LUNMistoAirCoordinator
+    from .export import LUNMistoAirExporter
+    from .manager import LUNMistoAirSnapshotManager
 
 
 @dataclass(slots=True)
@@ -17,12 +18,16 @@ class LUNMistoAirRuntimeData:
     """
     Runtime data stored on the config entry.
 
-    Holds shared objects for the integration lifetime, such as the API client
-    and per-station coordinators, keyed by subentry_id.
+    Holds shared objects for the integration lifetime, such as the snapshot
+    manager and per-station coordinators, keyed by subentry_id. Options are
+    kept to tell option changes from subentry changes on update.
     """
 
-    api: LUNMistoAirApi
+    manager: LUNMistoAirSnapshotManager
+    options: dict[str, Any] = field(default_factory=dict)
     coordinators: dict[str, LUNMistoAirCoordinator] = field(default_factory=dict)
+    exporter: LUNMistoAirExporter | None = None
+    setup_duration: float | None = None
 
 
 # Type alias for a typed config entry with our runtime data
@@ -9,10 +9,18 @@ from __future__ import annotations
 from dataclasses import asdict, is_dataclass
 from typing import TYPE_CHECKING, cast
 
-from homeassistant.const import CONF_LATITUDE, CONF_LONGITUDE, CONF_NAME
+from homeassistant.const import (
+    CONF_ENTITY_ID,
+    CONF_LATITUDE,
+    CONF_LONGITUDE,
+    CONF_NAME,
+)
 from homeassistant.helpers import entity_registry as er
 
+from .api import CONNECT_TIMEOUT, READ_TIMEOUT
 from .const import CONF_STATION_NAME, CONF_STATION_TYPE
+from .health import count_unhealthy, health_names
+from .memory import async_measure_memory
 
 if TYPE_CHECKING:
     from homeassistant.core import HomeAssistant
@@ -56,7 +64,8 @@ async def async_get_config_entry_diagnostics(
                         CONF_STATION_TYPE,
                     ),
                     "last_update_success": coordinator.last_update_success,
-                    "update_interval": str(coordinator.update_interval),
+                    "refresh_interval": str(coordinator.refresh_interval),
+                    "health": health_names(coordinator.health),
                     "last_exception": (
                         str(coordinator.last_exception)
                         if coordinator.last_exception
@@ -81,15 +90,92 @@ async def async_get_config_entry_diagnostics(
                     "station_name": data.get(CONF_STATION_NAME),
                     "latitude": data.get(CONF_LATITUDE),
                     "longitude": data.get(CONF_LONGITUDE),
+                    "entity_id": data.get(CONF_ENTITY_ID),
                 },
                 "options": dict(cast("dict[str, object]", subentry_options)),
             }
         )
 
+    snapshot_info = None
     api_info = None
-    if runtime_data and runtime_data.api:
+    memory_info = None
+    scale_info = None
+    if runtime_data and runtime_data.manager:
+        manager = runtime_data.manager
+        snapshot = manager.snapshot
+        snapshot_info = {
+            "last_update_success": manager.coordinator.last_update_success,
+            "update_interval": str(manager.coordinator.update_interval),
+            "version": snapshot.version if snapshot else None,
+            "fetched_at": snapshot.fetched_at.isoformat() if snapshot else None,
+            "fetch_count": manager.fetch_count,
+            "station_count": len(snapshot.stations) if snapshot else 0,
+            "indexed_stations": len(snapshot.index) if snapshot else 0,
+            "materialized_stations": (
+                snapshot.stations.materialized if snapshot else 0
+            ),
+            "unhealthy_stations": (
+                count_unhealthy(snapshot.health.values()) if snapshot else None
+            ),
+            "subscribed_stations": sorted(manager.dispatcher.station_names),
+            "listener_count": manager.dispatcher.listener_count,
+            "diff_stats": asdict(manager.diff_stats),
+            "refresh_stats": manager.refresh_stats.as_dict(),
+        }
+        rate_limiter = manager.api.rate_limiter
         api_info = {
-            "base_url": runtime_data.api.base_url,
+            "base_url": manager.api.base_url,
+            "sources": manager.source.as_dict(),
+            "transport": {
+                "connect_timeout": CONNECT_TIMEOUT,
+                "read_timeout": READ_TIMEOUT,
+                **asdict(manager.transport.stats),
+            },
+            "recorder": (
+                {
+                    "path": str(manager.recorder.path),
+                    **asdict(manager.recorder.stats),
+                }
+                if manager.recorder
+                else None
+            ),
+            "rate_limiter": {
+                "rate": rate_limiter.rate,
+                "burst": rate_limiter.burst,
+                "queue_length": rate_limiter.queue_length,
+                **asdict(rate_limiter.stats),
+            },
+        }
+        memory_info = await async_measure_memory(hass, entry)
+        scale_info = {
+            "stations": len(runtime_data.coordinators),
+            "entities": len(entities),
+            "setup_duration": runtime_data.setup_duration,
+            "outbound_requests": rate_limiter.stats.requests,
+            "fetch_count": manager.fetch_count,
+            "refresh_interval": str(manager.refresh_interval),
+        }
+
+    profile_info = None
+    if runtime_data and runtime_data.manager:
+        profiler = runtime_data.manager.profiler
+        profile_info = {
+            "active": (
+                {"cycles": profiler.cycles, "completed": profiler.completed}
+                if profiler
+                else None
+            ),
+            "last": runtime_data.manager.profile_summary,
+        }
+
+    export_info = None
+    if runtime_data and (exporter := runtime_data.exporter):
+        export_info = {
+            "path": str(exporter.path),
+            "cities": sorted(exporter.cities),
+            "retention": str(exporter.retention),
+            "buffered": exporter.buffered,
+            **asdict(exporter.stats),
         }
 
     return {
@@ -104,7 +190,12 @@ async def async_get_config_entry_diagnostics(
             "options": dict(entry.options),
         },
         "subentries": subentries,
+        "snapshot": snapshot_info,
         "coordinators": coordinators,
         "api": api_info,
+        "memory": memory_info,
+        "scale": scale_info,
+        "export": export_info,
+        "profile": profile_info,
         "entities": entity_states,
     }
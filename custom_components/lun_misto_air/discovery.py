@@ -0,0 +1,130 @@
+"""Discovery of new stations near home for LUN Misto Air integration."""
+
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers import issue_registry as ir
+from homeassistant.util import slugify
+
+from .const import (
+    CONF_DISCOVERY_RADIUS,
+    CONF_STATION_NAME,
+    DEFAULT_DISCOVERY_RADIUS,
+    DOMAIN,
+    ISSUE_NEW_STATION,
+    STATION_NAME_FORMAT,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Collection
+
+    from .data import LUNMistoAirConfigEntry
+    from .manager import LUNMistoAirSnapshotManager
+    from .snapshot import LUNMistoAirSnapshot, LUNMistoAirSnapshotDiff
+
+LOGGER = logging.getLogger(__name__)
+
+
+def new_station_issue_id(station_name: str) -> str:
+    """Return the repair issue id proposing to add a station."""
+    return f"{ISSUE_NEW_STATION}_{slugify(station_name)}"
+
+
+def configured_station_names(entry: LUNMistoAirConfigEntry) -> set[str]:
+    """Return names of stations configured as static subentries."""
+    return {
+        station_name
+        for subentry in entry.subentries.values()
+        if (station_name := subentry.data.get(CONF_STATION_NAME))
+    }
+
+
+@callback
+def async_dismiss_configured_stations(
+    hass: HomeAssistant,
+    entry: LUNMistoAirConfigEntry,
+) -> None:
+    """Delete proposals for stations that have been configured since."""
+    for station_name in configured_station_names(entry):
+        ir.async_delete_issue(hass, DOMAIN, new_station_issue_id(station_name))
+
+
+@callback
+def _async_propose_stations(
+    hass: HomeAssistant,
+    entry: LUNMistoAirConfigEntry,
+    snapshot: LUNMistoAirSnapshot,
+    candidates: Collection[str] | None = None,
+) -> None:
+    """Propose unconfigured stations near home, optionally only candidates."""
+    radius = entry.options.get(CONF_DISCOVERY_RADIUS, DEFAULT_DISCOVERY_RADIUS)
+    if not radius or (candidates is not None and not candidates):
+        return
+
+    configured = configured_station_names(entry)
+    nearby = snapshot.index.within(
+        hass.config.latitude,
+        hass.config.longitude,
+        radius * 1000,
+    )
+
+    for distance, point in nearby:
+        if point.name in configured or (
+            candidates is not None and point.name not in candidates
+        ):
+            continue
+        station = snapshot.stations[point.name]
+
+        LOGGER.info(
+            "Proposing station %s %.1f km from home",
+            station.name,
+            distance / 1000,
+        )
+        ir.async_create_issue(
+            hass,
+            DOMAIN,
+            new_station_issue_id(station.name),
+            is_fixable=True,
+            # The lowest severity repairs offer; the proposal can be ignored
+            severity=ir.IssueSeverity.WARNING,
+            translation_key=ISSUE_NEW_STATION,
+            translation_placeholders={
+                "name": STATION_NAME_FORMAT.format(
+                    city=station.city.capitalize(),
+                    station=station.name,
+                ),
+                "distance": f"{distance / 1000:.1f}",
+            },
+            data={
+                "entry_id": entry.entry_id,
+                CONF_STATION_NAME: station.name,
+            },
+        )
+
+
+@callback
+def async_setup_discovery(
+    hass: HomeAssistant,
+    entry: LUNMistoAirConfigEntry,
+    manager: LUNMistoAirSnapshotManager,
+) -> CALLBACK_TYPE:
+    """Propose stations near home now and whenever the snapshot gains stations."""
+    async_dismiss_configured_stations(hass, entry)
+
+    # Stations that appeared while Home Assistant was not running have no diff
+    if manager.snapshot is not None:
+        _async_propose_stations(hass, entry, manager.snapshot)
+
+    @callback
+    def _async_handle_diff(
+        snapshot: LUNMistoAirSnapshot,
+        diff: LUNMistoAirSnapshotDiff,
+    ) -> None:
+        for station_name in diff.removed:
+            ir.async_delete_issue(hass, DOMAIN, new_station_issue_id(station_name))
+        _async_propose_stations(hass, entry, snapshot, set(diff.added))
+
+    return manager.async_add_diff_listener(_async_handle_diff)
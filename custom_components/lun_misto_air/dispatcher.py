@@ -0,0 +1,95 @@
+"""Station-keyed listener registry for LUN Misto Air integration."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from homeassistant.core import CALLBACK_TYPE, callback
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+
+class LUNMistoAirDispatcher:
+    """
+    Station-keyed listener registry.
+
+    Listeners subscribe to the station names they track. After a snapshot
+    refresh only the listeners of stations whose records changed are called,
+    so the cost of a refresh scales with the number of changed stations rather
+    than with the number of tracked ones.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the dispatcher."""
+        self._listeners: dict[str, dict[CALLBACK_TYPE, None]] = {}
+        self._topology_listeners: dict[CALLBACK_TYPE, None] = {}
+
+    @property
+    def station_names(self) -> set[str]:
+        """Return the names of stations that have listeners."""
+        return set(self._listeners)
+
+    @property
+    def listener_count(self) -> int:
+        """Return the total number of registered listeners."""
+        return sum(len(listeners) for listeners in self._listeners.values()) + len(
+            self._topology_listeners
+        )
+
+    @callback
+    def async_add_listener(
+        self,
+        station_name: str,
+        update_callback: CALLBACK_TYPE,
+    ) -> CALLBACK_TYPE:
+        """Listen for changes of a single station."""
+        listeners = self._listeners.setdefault(station_name, {})
+        listeners[update_callback] = None
+
+        @callback
+        def remove_listener() -> None:
+            listeners.pop(update_callback, None)
+            if not listeners and self._listeners.get(station_name) is listeners:
+                del self._listeners[station_name]
+
+        return remove_listener
+
+    @callback
+    def async_add_topology_listener(
+        self,
+        update_callback: CALLBACK_TYPE,
+    ) -> CALLBACK_TYPE:
+        """Listen for stations being added to or removed from the snapshot."""
+        self._topology_listeners[update_callback] = None
+
+        @callback
+        def remove_listener() -> None:
+            self._topology_listeners.pop(update_callback, None)
+
+        return remove_listener
+
+    @callback
+    def async_dispatch(
+        self,
+        station_names: Iterable[str],
+        *,
+        topology_changed: bool = False,
+    ) -> int:
+        """Call listeners of the given stations and return the number of calls."""
+        callbacks: dict[CALLBACK_TYPE, None] = {}
+        for station_name in station_names:
+            if listeners := self._listeners.get(station_name):
+                callbacks.update(listeners)
+        if topology_changed:
+            callbacks.update(self._topology_listeners)
+
+        for update_callback in callbacks:
+            update_callback()
+
+        return len(callbacks)
+
+    @callback
+    def async_dispatch_all(self) -> int:
+        """Call every listener, e.g. when the snapshot becomes (un)available."""
+        return self.async_dispatch(list(self._listeners), topology_changed=True)
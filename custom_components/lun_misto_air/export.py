@@ -0,0 +1,289 @@
+"""Local time-series export of station readings for LUN Misto Air integration."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import operator
+import sqlite3
+import time
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.util import dt as dt_util
+
+from .api import RECORD_KEYS
+from .const import DOMAIN
+from .health import parse_updated
+from .profiling import async_add_executor_job
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from pathlib import Path
+
+    from .manager import LUNMistoAirSnapshotManager
+    from .snapshot import StationRow
+
+LOGGER = logging.getLogger(__name__)
+
+# Buffered rows are written when either limit is reached
+FLUSH_INTERVAL = timedelta(minutes=30)
+MAX_BATCH_ROWS = 10_000
+# Expired readings are deleted at most this often
+RETENTION_INTERVAL = 86400  # seconds
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS stations (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    city TEXT NOT NULL,
+    latitude REAL,
+    longitude REAL
+);
+CREATE TABLE IF NOT EXISTS readings (
+    station_id INTEGER NOT NULL REFERENCES stations (id),
+    ts INTEGER NOT NULL,
+    aqi INTEGER,
+    pm1 REAL,
+    pm25 REAL,
+    pm10 REAL,
+    temperature REAL,
+    humidity REAL,
+    pressure REAL,
+    PRIMARY KEY (station_id, ts)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS readings_ts ON readings (ts);
+"""
+
+# Fetch time of a snapshot and the rows of its exported stations
+type _Batch = tuple[int, list[StationRow]]
+
+# Positions of the fields in station rows, see RECORD_KEYS
+_FIELDS = list(RECORD_KEYS)
+_NAME = _FIELDS.index("name")
+_CITY = _FIELDS.index("city")
+_UPDATED = _FIELDS.index("updated")
+_PRESSURE = _FIELDS.index("pressure")
+_station = operator.itemgetter(
+    *(_FIELDS.index(field) for field in ("name", "city", "latitude", "longitude"))
+)
+_readings = operator.itemgetter(
+    *(
+        _FIELDS.index(field)
+        for field in (
+            "aqi",
+            "avg_pm10",
+            "avg_pm25",
+            "avg_pm100",
+            "temperature",
+            "humidity",
+        )
+    )
+)
+
+
+@dataclass(slots=True)
+class LUNMistoAirExporterStats:
+    """Counters of exported readings."""
+
+    rows_written: int = 0
+    rows_deleted: int = 0
+    flushes: int = 0
+    errors: int = 0
+    last_flush_duration: float | None = None
+
+
+def _reading(station_id: int, row: StationRow, fetched_ts: int) -> tuple[Any, ...]:
+    """Return a readings table row, timed by when the station reported it."""
+    # Records without a parsable timestamp are timed by the fetch
+    updated = parse_updated(row[_UPDATED])
+    ts = int(updated.timestamp()) if updated else fetched_ts
+    pressure = row[_PRESSURE]
+    return (
+        station_id,
+        ts,
+        *_readings(row),
+        pressure / 100 if pressure is not None else None,
+    )
+
+
+def _write(
+    path: Path,
+    batches: list[_Batch],
+    expire_before: int | None,
+) -> tuple[int, int]:
+    """Append rows and delete expired ones; runs in the executor."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    connection = sqlite3.connect(path)
+    try:
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        with connection:
+            connection.executescript(SCHEMA)
+            # Moved or renamed stations take the metadata of their latest row
+            connection.executemany(
+                "INSERT INTO stations (name, city, latitude, longitude) "
+                "VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (name) DO UPDATE SET city = excluded.city, "
+                "latitude = excluded.latitude, longitude = excluded.longitude "
+                "WHERE city IS NOT excluded.city "
+                "OR latitude IS NOT excluded.latitude "
+                "OR longitude IS NOT excluded.longitude",
+                {
+                    row[_NAME]: _station(row) for _, rows in batches for row in rows
+                }.values(),
+            )
+            station_ids = dict(connection.execute("SELECT name, id FROM stations"))
+            # Unchanged readings carry the same timestamp and are skipped
+            written = connection.executemany(
+                "INSERT OR IGNORE INTO readings VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    _reading(station_ids[row[_NAME]], row, fetched_ts)
+                    for fetched_ts, rows in batches
+                    for row in rows
+                ),
+            ).rowcount
+            deleted = 0
+            if expire_before is not None:
+                deleted = connection.execute(
+                    "DELETE FROM readings WHERE ts < ?",
+                    (expire_before,),
+                ).rowcount
+    finally:
+        connection.close()
+    return written, deleted
+
+
+class LUNMistoAirExporter:
+    """
+    Append readings of every station to a local SQLite database.
+
+    Each new snapshot is buffered in memory and written in batches from the
+    executor, so the recorder and the event loop are not loaded.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        path: Path,
+        cities: Iterable[str],
+        retention: timedelta,
+    ) -> None:
+        """Initialize the exporter."""
+        self.hass = hass
+        self.path = path
+        self.cities = {city.casefold() for city in cities}
+        self.retention = retention
+        self.stats = LUNMistoAirExporterStats()
+        self._batches: list[_Batch] = []
+        self._buffered = 0
+        self._version: int | None = None
+        self._lock = asyncio.Lock()
+        self._expired_at = 0.0
+
+    @property
+    def buffered(self) -> int:
+        """Return the number of rows waiting to be written."""
+        return self._buffered
+
+    @callback
+    def async_start(self, manager: LUNMistoAirSnapshotManager) -> CALLBACK_TYPE:
+        """Export every new snapshot; returns a callback flushing and stopping."""
+
+        @callback
+        def _async_handle_refresh() -> None:
+            snapshot = manager.snapshot
+            if snapshot is None or snapshot.version == self._version:
+                return
+            self._version = snapshot.version
+
+            # Rows are buffered as they are and turned into readings in the
+            # executor, so no station is built here
+            rows = list(snapshot.stations.rows.values())
+            if self.cities:
+                rows = [row for row in rows if row[_CITY].casefold() in self.cities]
+            self._batches.append((int(snapshot.fetched_at.timestamp()), rows))
+            self._buffered += len(rows)
+            if self._buffered >= MAX_BATCH_ROWS:
+                self._async_schedule_flush()
+
+        @callback
+        def _async_handle_interval(_now: object) -> None:
+            self._async_schedule_flush()
+
+        async def _async_handle_stop(_event: Event) -> None:
+            # Entries are not unloaded on shutdown; awaited so the buffer is not lost
+            await self.async_flush()
+
+        unsubs = [
+            manager.coordinator.async_add_listener(_async_handle_refresh),
+            async_track_time_interval(
+                self.hass,
+                _async_handle_interval,
+                FLUSH_INTERVAL,
+                name=f"{DOMAIN} export",
+                cancel_on_shutdown=True,
+            ),
+            self.hass.bus.async_listen(EVENT_HOMEASSISTANT_STOP, _async_handle_stop),
+        ]
+        _async_handle_refresh()
+
+        @callback
+        def _async_stop() -> None:
+            for unsub in unsubs:
+                unsub()
+            self._async_schedule_flush()
+
+        return _async_stop
+
+    @callback
+    def _async_schedule_flush(self) -> None:
+        if self._buffered:
+            self.hass.async_create_background_task(
+                self.async_flush(),
+                f"{DOMAIN} export flush",
+            )
+
+    async def async_flush(self) -> None:
+        """Write buffered rows and apply retention."""
+        batches, self._batches = self._batches, []
+        rows, self._buffered = self._buffered, 0
+        if not rows:
+            return
+
+        expire_before = None
+        if time.monotonic() - self._expired_at >= RETENTION_INTERVAL:
+            self._expired_at = time.monotonic()
+            expire_before = int((dt_util.utcnow() - self.retention).timestamp())
+
+        # Batches are written in order, one at a time
+        async with self._lock:
+            start = time.monotonic()
+            try:
+                written, deleted = await async_add_executor_job(
+                    self.hass,
+                    _write,
+                    self.path,
+                    batches,
+                    expire_before,
+                )
+            except (OSError, sqlite3.Error) as err:
+                self.stats.errors += 1
+                LOGGER.warning("Cannot export readings to %s: %s", self.path, err)
+                return
+
+        self.stats.flushes += 1
+        self.stats.rows_written += written
+        self.stats.rows_deleted += deleted
+        self.stats.last_flush_duration = time.monotonic() - start
+        LOGGER.debug(
+            "Exported %d of %d readings to %s, %d expired",
+            written,
+            rows,
+            self.path,
+            deleted,
+        )
@@ -0,0 +1,154 @@
+"""Spatial index of stations for LUN Misto Air integration."""
+
+from __future__ import annotations
+
+import math
+from typing import TYPE_CHECKING, NamedTuple
+
+from homeassistant.util import location
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+# Grid cell size in degrees, roughly 11 km along a meridian
+CELL_SIZE_DEG = 0.1
+# Slightly below the real value, so distance lower bounds stay conservative
+METERS_PER_DEG = 111_000
+
+type _Cell = tuple[int, int]
+
+
+class LUNMistoAirStationPoint(NamedTuple):
+    """Name and coordinates of a station, all the index needs."""
+
+    name: str
+    latitude: float
+    longitude: float
+
+
+def _distance(lat: float, lon: float, station: LUNMistoAirStationPoint) -> float:
+    """Return the distance to a station in meters or infinity if unknown."""
+    distance = location.distance(lat, lon, station.latitude, station.longitude)
+    return distance if distance is not None else float("inf")
+
+
+class LUNMistoAirStationIndex:
+    """
+    Uniform latitude/longitude grid over station coordinates.
+
+    Nearest-station and radius lookups only visit the grid cells around the
+    query point instead of measuring the distance to every station.
+    """
+
+    __slots__ = ("_cell_size", "_cells", "_size")
+
+    def __init__(
+        self,
+        stations: Iterable[LUNMistoAirStationPoint],
+        cell_size: float = CELL_SIZE_DEG,
+    ) -> None:
+        """Build the index."""
+        self._cell_size = cell_size
+        self._cells: dict[_Cell, list[LUNMistoAirStationPoint]] = {}
+        self._size = 0
+        for station in stations:
+            cell = self._cell(station.latitude, station.longitude)
+            self._cells.setdefault(cell, []).append(station)
+            self._size += 1
+
+    def __len__(self) -> int:
+        """Return the number of indexed stations."""
+        return self._size
+
+    def _cell(self, lat: float, lon: float) -> _Cell:
+        return (math.floor(lat / self._cell_size), math.floor(lon / self._cell_size))
+
+    def _ring(
+        self, center: _Cell, radius: int
+    ) -> Iterable[list[LUNMistoAirStationPoint]]:
+        """Yield occupied cells at the given Chebyshev distance from center."""
+        row, col = center
+        if radius == 0:
+            if cell := self._cells.get(center):
+                yield cell
+            return
+        for d_col in range(-radius, radius + 1):
+            for d_row in (-radius, radius):
+                if cell := self._cells.get((row + d_row, col + d_col)):
+                    yield cell
+        for d_row in range(-radius + 1, radius):
+            for d_col in (-radius, radius):
+                if cell := self._cells.get((row + d_row, col + d_col)):
+                    yield cell
+
+    def _ring_min_distance(self, lat: float, radius: int) -> float:
+        """Return a lower bound in meters for points outside the given ring."""
+        # Longitude degrees shrink towards the poles, so be conservative
+        max_lat = min(abs(lat) + (radius + 1) * self._cell_size, 89.9)
+        meters_per_deg = METERS_PER_DEG * math.cos(math.radians(max_lat))
+        return radius * self._cell_size * meters_per_deg
+
+    def nearest(
+        self,
+        lat: float,
+        lon: float,
+        accept: Callable[[LUNMistoAirStationPoint], bool] | None = None,
+    ) -> LUNMistoAirStationPoint | None:
+        """Return the closest station to the given point, of those accepted."""
+        center = self._cell(lat, lon)
+        best: LUNMistoAirStationPoint | None = None
+        best_distance = float("inf")
+        radius = 0
+
+        while self._size:
+            # Past this point a full scan visits fewer cells than another ring
+            if 8 * radius > len(self._cells):
+                for cell in self._cells.values():
+                    for station in cell:
+                        if accept is not None and not accept(station):
+                            continue
+                        distance = _distance(lat, lon, station)
+                        if distance < best_distance:
+                            best, best_distance = station, distance
+                break
+
+            for cell in self._ring(center, radius):
+                for station in cell:
+                    if accept is not None and not accept(station):
+                        continue
+                    distance = _distance(lat, lon, station)
+                    if distance < best_distance:
+                        best, best_distance = station, distance
+
+            if best is not None and best_distance <= self._ring_min_distance(
+                lat, radius
+            ):
+                break
+            radius += 1
+
+        return best
+
+    def within(
+        self,
+        lat: float,
+        lon: float,
+        radius_m: float,
+    ) -> list[tuple[float, LUNMistoAirStationPoint]]:
+        """Return stations within a radius as (distance, station), nearest first."""
+        row, col = self._cell(lat, lon)
+        lat_cells = math.ceil(radius_m / (METERS_PER_DEG * self._cell_size))
+        meters_per_deg_lon = METERS_PER_DEG * math.cos(
+            math.radians(min(abs(lat) + lat_cells * self._cell_size, 89.9))
+        )
+        lon_cells = math.ceil(radius_m / (meters_per_deg_lon * self._cell_size))
+
+        found: list[tuple[float, LUNMistoAirStationPoint]] = []
+        for d_row in range(-lat_cells, lat_cells + 1):
+            for d_col in range(-lon_cells, lon_cells + 1):
+                for station in self._cells.get((row + d_row, col + d_col), ()):
+                    distance = _distance(lat, lon, station)
+                    if distance <= radius_m:
+                        found.append((distance, station))
+
+        found.sort(key=lambda item: item[0])
+        return found
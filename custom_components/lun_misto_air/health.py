@@ -0,0 +1,105 @@
+"""Station health classification for LUN Misto Air integration."""
+
+from __future__ import annotations
+
+from enum import IntFlag, auto
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.util import dt as dt_util
+
+from .const import MAX_HUMIDITY, MAX_PRESSURE_PA, MIN_HUMIDITY, MIN_PRESSURE_PA
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from datetime import datetime
+
+
+class LUNMistoAirHealth(IntFlag):
+    """Readings of a station that are plausible, and whether it still reports."""
+
+    NONE = 0
+    AQI = auto()
+    PM1 = auto()
+    PM25 = auto()
+    PM10 = auto()
+    TEMPERATURE = auto()
+    HUMIDITY = auto()
+    PRESSURE = auto()
+    FRESH = auto()
+
+
+# What a station needs to be picked as the nearest one
+ONLINE = LUNMistoAirHealth.AQI | LUNMistoAirHealth.FRESH
+
+
+def classify_record(
+    record: dict[str, Any], stale_before: datetime
+) -> LUNMistoAirHealth:
+    """Return the health of a raw station record."""
+    health = LUNMistoAirHealth.NONE
+    if record["aqi"] is not None:
+        health |= LUNMistoAirHealth.AQI
+    if record["avgPm10"] is not None:
+        health |= LUNMistoAirHealth.PM1
+    if record["avgPm25"] is not None:
+        health |= LUNMistoAirHealth.PM25
+    if record["avgPm100"] is not None:
+        health |= LUNMistoAirHealth.PM10
+
+    temperature, humidity, pressure = (
+        record["temperature"],
+        record["humidity"],
+        record["pressure"],
+    )
+    # The API reports zeros for the whole weather block when it is offline
+    if temperature is not None and not (temperature == humidity == pressure == 0):
+        health |= LUNMistoAirHealth.TEMPERATURE
+    if humidity is not None and MIN_HUMIDITY < humidity <= MAX_HUMIDITY:
+        health |= LUNMistoAirHealth.HUMIDITY
+    if pressure is not None and MIN_PRESSURE_PA <= pressure <= MAX_PRESSURE_PA:
+        health |= LUNMistoAirHealth.PRESSURE
+
+    # Stations without a parsable timestamp are not penalized
+    updated_at = _updated_at(record)
+    if updated_at is None or updated_at >= stale_before:
+        health |= LUNMistoAirHealth.FRESH
+
+    return health
+
+
+def parse_updated(updated: Any) -> datetime | None:
+    """Return a reported timestamp in UTC, naive ones in the configured zone."""
+    updated_at = dt_util.parse_datetime(updated) if isinstance(updated, str) else None
+    return dt_util.as_utc(updated_at) if updated_at is not None else None
+
+
+def _updated_at(record: dict[str, Any]) -> datetime | None:
+    """Return when a station last reported, in UTC."""
+    return parse_updated(record.get("updated"))
+
+
+def newest_update(records: Iterable[Any]) -> datetime | None:
+    """Return when the most recently reporting station reported."""
+    return max(
+        (
+            updated_at
+            for record in records
+            if isinstance(record, dict) and (updated_at := _updated_at(record))
+        ),
+        default=None,
+    )
+
+
+def health_names(health: LUNMistoAirHealth) -> list[str]:
+    """Return lowercase names of the flags set."""
+    return [flag.name.lower() for flag in LUNMistoAirHealth if flag in health]
+
+
+def count_unhealthy(healths: Iterable[LUNMistoAirHealth]) -> dict[str, int]:
+    """Return the number of stations missing each flag."""
+    counts = dict.fromkeys(LUNMistoAirHealth, 0)
+    for health in healths:
+        for flag in counts:
+            if flag not in health:
+                counts[flag] += 1
+    return {health_names(flag)[0]: count for flag, count in counts.items()}
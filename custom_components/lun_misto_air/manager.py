@@ -0,0 +1,399 @@
+"""Shared station snapshot manager for LUN Misto Air integration."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from datetime import timedelta
+from functools import partial
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers.aiohttp_client import async_create_clientsession
+from homeassistant.util import dt as dt_util
+from homeassistant.util.hass_dict import HassKey
+from homeassistant.util.json import json_loads
+
+from .api import (
+    LUNMistoAirApi,
+    LUNMistoAirPriority,
+    LUNMistoAirStation,
+    LUNMistoAirStationNotFoundError,
+    LUNMistoAirTransport,
+)
+from .const import (
+    CONF_ERROR_THRESHOLD,
+    CONF_LATENCY_THRESHOLD,
+    CONF_MIRROR_URL,
+    CONF_RECORD_FILE,
+    CONF_REPLAY_FILE,
+    CONF_REPLAY_SPEED,
+    CONF_SOURCE_FILE,
+    DEFAULT_ERROR_THRESHOLD,
+    DEFAULT_LATENCY_THRESHOLD,
+    DEFAULT_REPLAY_SPEED,
+    DOMAIN,
+    EVENT_SNAPSHOT_DIFF,
+    UPDATE_INTERVAL,
+)
+from .coordinator import LUNMistoAirSnapshotCoordinator
+from .dispatcher import LUNMistoAirDispatcher
+from .profiling import (
+    DATA_PROFILER,
+    STAGE_BUILD,
+    STAGE_DISPATCH,
+    STAGE_FETCH,
+    LUNMistoAirProfiler,
+    profile_stage,
+    write_summary,
+)
+from .recording import LUNMistoAirRecorder, LUNMistoAirReplaySource
+from .snapshot import (
+    LUNMistoAirDiffStats,
+    LUNMistoAirRefreshStats,
+    LUNMistoAirSnapshot,
+    LUNMistoAirSnapshotDiff,
+    LUNMistoAirStations,
+    build_snapshot,
+)
+from .sources import (
+    SOURCE_FILE,
+    SOURCE_MIRROR,
+    SOURCE_PRIMARY,
+    SOURCE_REPLAY,
+    LUNMistoAirFailoverSource,
+    LUNMistoAirFileSource,
+    LUNMistoAirSource,
+    LUNMistoAirUrlSource,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Mapping
+
+LOGGER = logging.getLogger(__name__)
+
+DATA_MANAGER: HassKey[LUNMistoAirSnapshotManager] = HassKey(DOMAIN)
+
+type DiffCallback = Callable[[LUNMistoAirSnapshot, LUNMistoAirSnapshotDiff], None]
+
+
+@callback
+def async_get_manager(hass: HomeAssistant) -> LUNMistoAirSnapshotManager:
+    """Return the snapshot manager, creating it on first use."""
+    if (manager := hass.data.get(DATA_MANAGER)) is None:
+        manager = hass.data[DATA_MANAGER] = LUNMistoAirSnapshotManager(hass)
+    return manager
+
+
+class LUNMistoAirSnapshotManager:
+    """
+    Process-wide owner of the station snapshot.
+
+    Holds the API client, the latest snapshot of all stations with its indexes
+    and the refresh schedule. Config entries, config flows and migrations all
+    read from it, so concurrent callers share a single in-flight request.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the manager."""
+        self.hass = hass
+        # Own session on the connector of Home Assistant, kept across entries
+        self.transport = LUNMistoAirTransport(
+            partial(async_create_clientsession, hass, auto_cleanup=False),
+            loads=json_loads,
+        )
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, self._async_close)
+        self.api = LUNMistoAirApi(transport=self.transport)
+        self.source = LUNMistoAirFailoverSource(
+            [LUNMistoAirUrlSource(SOURCE_PRIMARY, self.api)],
+            latency_threshold=DEFAULT_LATENCY_THRESHOLD,
+            error_threshold=DEFAULT_ERROR_THRESHOLD,
+        )
+        # Sources and recording follow the entry options once it is set up
+        self.recorder: LUNMistoAirRecorder | None = None
+        self.dispatcher = LUNMistoAirDispatcher()
+        self.coordinator = LUNMistoAirSnapshotCoordinator(hass, self)
+        self.snapshot: LUNMistoAirSnapshot | None = None
+        self.fetch_count = 0
+        self.diff_stats = LUNMistoAirDiffStats()
+        self.refresh_stats = LUNMistoAirRefreshStats()
+        self._fetch_task: asyncio.Task[LUNMistoAirSnapshot] | None = None
+        self._unsub_dispatch: CALLBACK_TYPE | None = None
+        self._dispatched_success = True
+        self._diff_listeners: dict[DiffCallback, None] = {}
+        self._refresh_intervals: list[timedelta] = []
+        self.profile_summary: dict[str, Any] | None = None
+
+    @property
+    def profiler(self) -> LUNMistoAirProfiler | None:
+        """Return the profiler while refresh cycles are being profiled."""
+        return self.hass.data.get(DATA_PROFILER)
+
+    @property
+    def stations(self) -> LUNMistoAirStations | None:
+        """Return the latest stations keyed by name."""
+        return self.snapshot.stations if self.snapshot else None
+
+    @property
+    def refresh_interval(self) -> timedelta:
+        """Return the interval of the most demanding subscriber."""
+        return min(self._refresh_intervals, default=timedelta(minutes=UPDATE_INTERVAL))
+
+    @property
+    def is_fresh(self) -> bool:
+        """Return True if the cached snapshot is younger than the update interval."""
+        if self.snapshot is None:
+            return False
+        age = dt_util.utcnow() - self.snapshot.fetched_at
+        return age < self.refresh_interval
+
+    @callback
+    def async_add_refresh_interval(self, interval: timedelta) -> CALLBACK_TYPE:
+        """
+        Request snapshots at least as often as the given interval.
+
+        All requests are served by a single schedule at the shortest interval;
+        it applies from the next scheduled refresh on.
+        """
+        self._refresh_intervals.append(interval)
+        self._async_update_refresh_interval()
+
+        @callback
+        def remove_interval() -> None:
+            self._refresh_intervals.remove(interval)
+            self._async_update_refresh_interval()
+
+        return remove_interval
+
+    @callback
+    def _async_update_refresh_interval(self) -> None:
+        # A replay keeps its recorded pace
+        if self.source.next_interval is None:
+            self.coordinator.update_interval = self.refresh_interval
+
+    def configure_sources(self, options: Mapping[str, Any]) -> None:
+        """Set up data sources, recording and replay from the entry options."""
+        self.recorder = None
+
+        sources: list[LUNMistoAirSource]
+        if replay_file := options.get(CONF_REPLAY_FILE):
+            # A replay is fully offline and is not recorded again
+            sources = [
+                LUNMistoAirReplaySource(
+                    SOURCE_REPLAY,
+                    self.hass,
+                    Path(self.hass.config.path(replay_file)),
+                    options.get(CONF_REPLAY_SPEED, DEFAULT_REPLAY_SPEED),
+                )
+            ]
+        else:
+            sources = [LUNMistoAirUrlSource(SOURCE_PRIMARY, self.api)]
+            if mirror_url := options.get(CONF_MIRROR_URL):
+                mirror = LUNMistoAirApi(transport=self.transport, base_url=mirror_url)
+                sources.append(LUNMistoAirUrlSource(SOURCE_MIRROR, mirror))
+            if source_file := options.get(CONF_SOURCE_FILE):
+                path = Path(self.hass.config.path(source_file))
+                sources.append(LUNMistoAirFileSource(SOURCE_FILE, self.hass, path))
+            if record_file := options.get(CONF_RECORD_FILE):
+                path = Path(self.hass.config.path(record_file))
+                self.recorder = LUNMistoAirRecorder(self.hass, path)
+
+        self.source = LUNMistoAirFailoverSource(
+            sources,
+            latency_threshold=options.get(
+                CONF_LATENCY_THRESHOLD,
+                DEFAULT_LATENCY_THRESHOLD,
+            ),
+            error_threshold=int(
+                options.get(CONF_ERROR_THRESHOLD, DEFAULT_ERROR_THRESHOLD)
+            ),
+        )
+
+    async def _async_fetch(self, priority: LUNMistoAirPriority) -> LUNMistoAirSnapshot:
+        """Fetch all stations and build a new snapshot."""
+        self.fetch_count += 1
+        start = time.perf_counter()
+        records = await self.source.async_fetch(priority)
+        fetched_at = dt_util.utcnow()
+        if self.profiler is not None:
+            self.profiler.record_span(STAGE_FETCH, time.perf_counter() - start)
+
+        if self.recorder is not None:
+            self.hass.async_create_background_task(
+                self.recorder.async_record(fetched_at, records),
+                f"{DOMAIN} record stations",
+            )
+
+        with profile_stage(self.profiler, STAGE_BUILD):
+            self.snapshot = build_snapshot(
+                records,
+                version=self.fetch_count,
+                fetched_at=fetched_at,
+                captured_at=self.source.captured_at,
+            )
+        return self.snapshot
+
+    async def async_fetch(
+        self,
+        priority: LUNMistoAirPriority = LUNMistoAirPriority.INTERACTIVE,
+    ) -> LUNMistoAirSnapshot:
+        """
+        Fetch all stations, joining a request that is already in flight.
+
+        A caller with a higher priority than the request it joins raises the
+        priority of that request.
+        """
+        task = self._fetch_task
+        if task is None or task.done():
+            task = self._fetch_task = self.hass.async_create_background_task(
+                self._async_fetch(priority),
+                f"{DOMAIN} fetch stations",
+            )
+        else:
+            self.api.rate_limiter.raise_priority(task, priority)
+        # Shield the shared request from cancellation of a single caller
+        return await asyncio.shield(task)
+
+    async def async_get_snapshot(self) -> LUNMistoAirSnapshot:
+        """Return the cached snapshot if fresh, otherwise fetch a new one."""
+        if self.is_fresh and self.snapshot is not None:
+            return self.snapshot
+        return await self.async_fetch()
+
+    async def async_get_stations(self) -> LUNMistoAirStations:
+        """Return cached stations if fresh, otherwise fetch them."""
+        return (await self.async_get_snapshot()).stations
+
+    async def async_get_station(self, station_name: str) -> LUNMistoAirStation:
+        """Return a station by its name."""
+        stations = await self.async_get_stations()
+        if (station := stations.get(station_name)) is None:
+            msg = f"Station with name '{station_name}' not found."
+            raise LUNMistoAirStationNotFoundError(msg)
+        return station
+
+    async def async_start(self) -> None:
+        """Make sure a snapshot is available and start the refresh schedule."""
+        if not self.is_fresh or not self.coordinator.last_update_success:
+            await self.coordinator.async_refresh()
+        elif self.coordinator.data is not self.snapshot and self.snapshot is not None:
+            # A config flow fetched a newer snapshot in the meantime
+            self.coordinator.async_set_updated_data(self.snapshot)
+
+        if not self.coordinator.last_update_success:
+            raise ConfigEntryNotReady(str(self.coordinator.last_exception))
+
+        if self._unsub_dispatch is None:
+            self._unsub_dispatch = self.coordinator.async_add_listener(
+                self._async_handle_refresh,
+            )
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop the refresh schedule; the cached snapshot is kept."""
+        if self._unsub_dispatch:
+            self._unsub_dispatch()
+            self._unsub_dispatch = None
+
+    async def _async_close(self, _event: Event) -> None:
+        """Let go of the session when Home Assistant shuts down."""
+        await self.transport.close()
+
+    @callback
+    def async_add_diff_listener(self, diff_callback: DiffCallback) -> CALLBACK_TYPE:
+        """Listen for non-empty diffs between consecutive snapshots."""
+        self._diff_listeners[diff_callback] = None
+
+        @callback
+        def remove_listener() -> None:
+            self._diff_listeners.pop(diff_callback, None)
+
+        return remove_listener
+
+    @callback
+    def _async_handle_refresh(self) -> None:
+        """Notify listeners and measure how long the event loop was busy."""
+        self.refresh_stats.start_cycle()
+        profiler = self.profiler
+        with profile_stage(profiler, STAGE_DISPATCH):
+            start = time.monotonic()
+            self._async_dispatch_refresh()
+            self.refresh_stats.record_dispatch(time.monotonic() - start)
+
+        if profiler is not None:
+            profiler.end_cycle()
+            if profiler.done:
+                self._async_finish_profiling()
+
+    @callback
+    def async_start_profiling(self, cycles: int, path: Path) -> None:
+        """Profile the next refresh cycles and write a summary to path."""
+        LOGGER.info("Profiling the next %d refreshes", cycles)
+        self.hass.data[DATA_PROFILER] = LUNMistoAirProfiler(cycles, path)
+
+    @callback
+    def _async_finish_profiling(self) -> None:
+        """Keep the summary for diagnostics and write it to the file."""
+        if (profiler := self.hass.data.pop(DATA_PROFILER, None)) is None:
+            return
+        self.profile_summary = {"path": str(profiler.path), **profiler.summary()}
+        self.hass.async_create_background_task(
+            self._async_write_profile(profiler.path, self.profile_summary),
+            f"{DOMAIN} write profile",
+        )
+
+    async def _async_write_profile(self, path: Path, summary: dict[str, Any]) -> None:
+        """Write a profile summary to a file."""
+        try:
+            await self.hass.async_add_executor_job(write_summary, path, summary)
+        except OSError as err:
+            LOGGER.warning("Cannot write profile to %s: %s", path, err)
+            return
+        LOGGER.info("Profile of %d refreshes written to %s", summary["cycles"], path)
+
+    @callback
+    def _async_dispatch_refresh(self) -> None:
+        """Notify only the listeners of stations whose records changed."""
+        coordinator = self.coordinator
+
+        if coordinator.last_update_success != self._dispatched_success:
+            # Availability flipped: every tracked station is affected
+            self._dispatched_success = coordinator.last_update_success
+            self.dispatcher.async_dispatch_all()
+            return
+
+        if not coordinator.last_update_success or coordinator.data is None:
+            return
+
+        diff = coordinator.diff
+        # Consume the diff, so a repeated notification does not replay it
+        coordinator.diff = LUNMistoAirSnapshotDiff()
+
+        if not diff.initial and diff.station_names:
+            self.diff_stats.record(diff)
+            self.hass.bus.async_fire(EVENT_SNAPSHOT_DIFF, diff.as_event_data())
+            for diff_callback in list(self._diff_listeners):
+                diff_callback(coordinator.data, diff)
+
+        if lost := self.dispatcher.station_names.intersection(diff.removed):
+            LOGGER.warning(
+                "Configured stations disappeared from LUN Misto Air: %s",
+                ", ".join(sorted(lost)),
+            )
+
+        calls = self.dispatcher.async_dispatch(
+            diff.station_names,
+            topology_changed=diff.topology_changed,
+        )
+
+        LOGGER.debug(
+            "Snapshot refresh: +%d -%d ~%d stations, %d listeners notified",
+            len(diff.added),
+            len(diff.removed),
+            len(diff.changed),
+            calls,
+        )
@@ -0,0 +1,141 @@
+"""Memory footprint measurement for LUN Misto Air integration."""
+
+from __future__ import annotations
+
+import logging
+import sys
+import tracemalloc
+from pathlib import Path
+from types import FunctionType, MethodType, ModuleType
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+
+from .views import DATA_STATIONS_VIEW
+
+if TYPE_CHECKING:
+    from .data import LUNMistoAirConfigEntry
+
+LOGGER = logging.getLogger(__name__)
+
+PACKAGE_DIR = Path(__file__).parent
+# Enough frames to reach integration code from json, gzip and dataclass internals
+TRACE_FRAMES = 25
+
+# Objects shared with the rest of Home Assistant, never counted
+_OPAQUE_TYPES = (type, ModuleType, FunctionType, MethodType)
+
+
+def deep_sizeof(obj: Any, seen: set[int] | None = None) -> int:
+    """Return the size of an object and everything it exclusively references."""
+    seen = set() if seen is None else seen
+    stack = [obj]
+    size = 0
+
+    while stack:
+        item = stack.pop()
+        if id(item) in seen or isinstance(item, _OPAQUE_TYPES):
+            continue
+        seen.add(id(item))
+        size += sys.getsizeof(item)
+
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, list | tuple | set | frozenset):
+            stack.extend(item)
+        elif not isinstance(item, str | bytes | int | float | bool):
+            stack.extend(
+                getattr(item, slot)
+                for cls in type(item).__mro__
+                for slot in getattr(cls, "__slots__", ())
+                if hasattr(item, slot)
+            )
+            if hasattr(item, "__dict__"):
+                stack.append(vars(item))
+
+    return size
+
+
+def _traced_by_module() -> dict[str, int]:
+    """Return live traced bytes by the innermost integration module allocating them."""
+    snapshot = tracemalloc.take_snapshot().filter_traces(
+        (
+            tracemalloc.Filter(
+                inclusive=True,
+                filename_pattern=f"{PACKAGE_DIR}/*",
+                all_frames=True,
+            ),
+        )
+    )
+
+    by_module: dict[str, int] = {}
+    for trace in snapshot.traces:
+        # Frames are ordered from the oldest to the most recent call
+        for frame in reversed(trace.traceback):
+            path = Path(frame.filename)
+            if path.parent == PACKAGE_DIR:
+                by_module[path.name] = by_module.get(path.name, 0) + trace.size
+                break
+
+    return dict(sorted(by_module.items(), key=lambda item: item[1], reverse=True))
+
+
+@callback
+def async_start_tracing() -> CALLBACK_TYPE:
+    """Start tracing allocations unless something else already does."""
+    if tracemalloc.is_tracing():
+        return lambda: None
+
+    LOGGER.info("Tracing memory allocations; this slows Home Assistant down")
+    tracemalloc.start(TRACE_FRAMES)
+
+    @callback
+    def _async_stop() -> None:
+        tracemalloc.stop()
+
+    return _async_stop
+
+
+async def async_measure_memory(
+    hass: HomeAssistant,
+    entry: LUNMistoAirConfigEntry,
+) -> dict[str, Any]:
+    """Return bytes held by the snapshot, caches and entity states."""
+    manager = entry.runtime_data.manager
+    snapshot = manager.snapshot
+    view = hass.data.get(DATA_STATIONS_VIEW)
+
+    # Objects already counted are skipped, so stations are not counted twice
+    seen: set[int] = set()
+    stations = deep_sizeof(snapshot.stations, seen) if snapshot else 0
+    index = deep_sizeof(snapshot.index, seen) if snapshot else 0
+
+    entity_registry = er.async_get(hass)
+    states = [
+        state
+        for entity in er.async_entries_for_config_entry(
+            entity_registry,
+            entry.entry_id,
+        )
+        if (state := hass.states.get(entity.entity_id)) is not None
+    ]
+    entity_states = deep_sizeof(states, seen)
+
+    traced = None
+    if tracemalloc.is_tracing():
+        by_module = await hass.async_add_executor_job(_traced_by_module)
+        traced = {"total": sum(by_module.values()), "by_module": by_module}
+
+    return {
+        "tracing": tracemalloc.is_tracing(),
+        "estimated": {
+            "snapshot_stations": stations,
+            "station_index": index,
+            "geojson_cache": view.cache_size if view else 0,
+            "entity_states": entity_states,
+            "per_entity": entity_states // len(states) if states else 0,
+        },
+        "traced": traced,
+    }
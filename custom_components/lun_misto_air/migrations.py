@@ -10,9 +10,7 @@ from homeassistant.config_entries import ConfigSubentry
 from homeassistant.const import CONF_NAME
 from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers import entity_registry as er
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
-from .api import LUNMistoAirApi
 from .const import (
     CONF_STATION_NAME,
     CONF_STATION_TYPE,
@@ -21,6 +19,7 @@ from .const import (
     STATION_TYPE_STATIC,
     SUBENTRY_TYPE_STATION,
 )
+from .manager import async_get_manager
 
 if TYPE_CHECKING:
     from homeassistant.config_entries import ConfigEntry
@@ -110,7 +109,7 @@ async def migrate_v1_to_v2(hass: HomeAssistant, entry: ConfigEntry) -> None:
 
 async def migrate_v2_to_v3(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Migrate VERSION 2 → VERSION 3: Add CONF_NAME to subentries."""
-    api = LUNMistoAirApi(session=async_get_clientsession(hass))
+    manager = async_get_manager(hass)
 
     for subentry in entry.subentries.values():
         if subentry.subentry_type != SUBENTRY_TYPE_STATION:
@@ -127,7 +126,7 @@ async def migrate_v2_to_v3(hass: HomeAssistant, entry: ConfigEntry) -> None:
         # Determine fallback name
         if station_name and station_type == STATION_TYPE_STATIC:
             try:
-                station = await api.get_station_by_name(station_name)
+                station = await manager.async_get_station(station_name)
                 fallback_name = STATION_NAME_FORMAT.format(
                     city=station.city.capitalize(),
                     station=station.name,
@@ -0,0 +1,200 @@
+"""On-demand profiling of refresh cycles for LUN Misto Air integration."""
+
+from __future__ import annotations
+
+import cProfile
+import json
+import logging
+import pstats
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.util import dt as dt_util
+from homeassistant.util.hass_dict import HassKey
+
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Generator
+    from pathlib import Path
+
+    from homeassistant.core import HomeAssistant
+
+LOGGER = logging.getLogger(__name__)
+
+# Set only while refresh cycles are being profiled
+DATA_PROFILER: HassKey[LUNMistoAirProfiler] = HassKey(f"{DOMAIN}_profiler")
+
+# Refresh stages timed separately, in the order they run
+STAGE_FETCH = "fetch"
+STAGE_BUILD = "build"
+STAGE_DIFF = "diff"
+STAGE_DISPATCH = "dispatch"
+
+HOT_FUNCTIONS = 25
+
+
+def write_summary(path: Path, summary: dict[str, Any]) -> None:
+    """Write a profile summary as JSON; runs in the executor."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(summary, indent=2), encoding="utf-8")
+
+
+async def async_add_executor_job[*Ts, T](
+    hass: HomeAssistant,
+    target: Callable[[*Ts], T],
+    *args: *Ts,
+) -> T:
+    """Run a job in the executor, timing it while refreshes are profiled."""
+    if (profiler := hass.data.get(DATA_PROFILER)) is None:
+        return await hass.async_add_executor_job(target, *args)
+
+    def _timed_job() -> T:
+        start = time.thread_time()
+        try:
+            return target(*args)
+        finally:
+            profiler.record_executor_job(time.thread_time() - start)
+
+    return await hass.async_add_executor_job(_timed_job)
+
+
+@contextmanager
+def profile_stage(
+    profiler: LUNMistoAirProfiler | None,
+    stage: str,
+) -> Generator[None]:
+    """Profile a refresh stage that runs on the event loop without awaiting."""
+    if profiler is None:
+        yield
+        return
+    profiler.start_stage()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        profiler.record_span(stage, time.perf_counter() - start)
+        profiler.end_stage()
+
+
+class LUNMistoAirProfiler:
+    """
+    cProfile and stage timers over a number of refresh cycles.
+
+    It only exists while a capture is running; the manager checks for it
+    before timing anything, so refreshes cost nothing extra otherwise. Only
+    the stages the integration runs on the event loop are profiled, not the
+    time spent waiting for the network or the rest of Home Assistant. CPU
+    time of these stages is told apart from that of the executor jobs of the
+    integration.
+    """
+
+    def __init__(self, cycles: int, path: Path) -> None:
+        """Initialize the profiler."""
+        self.cycles = cycles
+        self.path = path
+        self.completed = 0
+        self.started_at = dt_util.utcnow()
+        self._profile = cProfile.Profile()
+        self._profiling = False
+        self._spans: dict[str, list[float]] = {}
+        self._cycle_start: float | None = None
+        self._stage_start: float | None = None
+        self._wall = 0.0
+        self._loop_cpu = 0.0
+        # Appended to from executor threads
+        self._executor_jobs: list[float] = []
+
+    @property
+    def done(self) -> bool:
+        """Return True once all requested cycles were captured."""
+        return self.completed >= self.cycles
+
+    def start_cycle(self) -> None:
+        """Start capturing a refresh; must be called on the event loop."""
+        # A failed refresh does not notify listeners, so close it here
+        self.end_cycle()
+        if self.done:
+            return
+        self._cycle_start = time.perf_counter()
+
+    def start_stage(self) -> None:
+        """Start profiling a stage of the current refresh."""
+        if self._cycle_start is None:
+            return
+        self._stage_start = time.thread_time()
+        try:
+            self._profile.enable()
+        except ValueError:
+            LOGGER.warning("Another profiler is active, only timing refresh stages")
+        else:
+            self._profiling = True
+
+    def end_stage(self) -> None:
+        """Stop profiling the current stage, if any."""
+        if self._profiling:
+            self._profile.disable()
+            self._profiling = False
+        if self._stage_start is not None:
+            self._loop_cpu += time.thread_time() - self._stage_start
+            self._stage_start = None
+
+    def record_executor_job(self, cpu_time: float) -> None:
+        """Account for the CPU time of an executor job of the integration."""
+        self._executor_jobs.append(cpu_time)
+
+    def record_span(self, stage: str, duration: float) -> None:
+        """Account for the duration of a refresh stage."""
+        self._spans.setdefault(stage, []).append(duration)
+
+    def end_cycle(self) -> None:
+        """Stop capturing the current refresh, if any."""
+        if self._cycle_start is None:
+            return
+        self.end_stage()
+        self._wall += time.perf_counter() - self._cycle_start
+        self._cycle_start = None
+        self.completed += 1
+
+    def _hot_functions(self) -> list[dict[str, Any]]:
+        """Return the functions with the most own time, hottest first."""
+        self._profile.create_stats()
+        entries = sorted(
+            self._profile.stats.items(),
+            key=lambda item: item[1][2],
+            reverse=True,
+        )
+        return [
+            {
+                "function": pstats.func_std_string(func),
+                "calls": calls,
+                "own_time": own_time,
+                "cumulative_time": cumulative_time,
+            }
+            for func, (_, calls, own_time, cumulative_time, _) in entries[
+                :HOT_FUNCTIONS
+            ]
+        ]
+
+    def summary(self) -> dict[str, Any]:
+        """Return the captured timings."""
+        return {
+            "started_at": self.started_at.isoformat(),
+            "finished_at": dt_util.utcnow().isoformat(),
+            "cycles": self.completed,
+            "wall_time": self._wall,
+            "loop_cpu_time": self._loop_cpu,
+            "executor_jobs": len(self._executor_jobs),
+            "executor_cpu_time": sum(self._executor_jobs),
+            "stages": {
+                stage: {
+                    "count": len(durations),
+                    "total": sum(durations),
+                    "mean": sum(durations) / len(durations),
+                    "max": max(durations),
+                }
+                for stage, durations in self._spans.items()
+            },
+            "hot_functions": self._hot_functions(),
+        }
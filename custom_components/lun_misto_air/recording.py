@@ -0,0 +1,191 @@
+"""Recording and replay of station responses for LUN Misto Air integration."""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import logging
+import zlib
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.helpers.json import json_bytes
+from homeassistant.util import dt as dt_util
+from homeassistant.util.json import json_loads
+
+from .api import LUNMistoAirError, LUNMistoAirPriority, LUNMistoAirResponseError
+from .profiling import async_add_executor_job
+from .sources import LUNMistoAirSource
+
+if TYPE_CHECKING:
+    from datetime import datetime
+    from pathlib import Path
+
+    from homeassistant.core import HomeAssistant
+
+LOGGER = logging.getLogger(__name__)
+
+# Replayed refreshes are never scheduled closer than this
+MIN_REPLAY_INTERVAL = timedelta(seconds=1)
+
+type _Frame = tuple[datetime, list[dict[str, Any]]]
+
+
+@dataclass(slots=True)
+class LUNMistoAirRecorderStats:
+    """Counters of recorded responses."""
+
+    frames: int = 0
+    bytes_written: int = 0
+    errors: int = 0
+
+
+def _append(path: Path, line: bytes) -> int:
+    """Append a line to the archive as a separate gzip member."""
+    data = gzip.compress(line)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("ab") as archive:
+        archive.write(data)
+    return len(data)
+
+
+def read_archive(path: Path) -> list[_Frame]:
+    """Return recorded responses with their timestamps, oldest first."""
+    frames: list[_Frame] = []
+    with gzip.open(path, "rb") as archive:
+        try:
+            for line in archive:
+                if not line.strip():
+                    continue
+                frame = json_loads(line)
+                fetched_at = dt_util.parse_datetime(frame["fetched_at"])
+                if fetched_at is None:
+                    msg = f"Invalid timestamp in {path}: {frame['fetched_at']}"
+                    raise ValueError(msg)
+                frames.append((fetched_at, frame["stations"]))
+        except (EOFError, zlib.error, gzip.BadGzipFile) as err:
+            # An append cut short by a crash leaves a truncated last member
+            LOGGER.warning(
+                "Archive %s is damaged after %d responses, replaying those: %s",
+                path,
+                len(frames),
+                err,
+            )
+    frames.sort(key=lambda frame: frame[0])
+    return frames
+
+
+class LUNMistoAirRecorder:
+    """Append raw station responses to a gzip-compressed JSON lines archive."""
+
+    def __init__(self, hass: HomeAssistant, path: Path) -> None:
+        """Initialize the recorder."""
+        self.hass = hass
+        self.path = path
+        self.stats = LUNMistoAirRecorderStats()
+        # Executor jobs may run in parallel, so appends are serialized
+        self._lock = asyncio.Lock()
+
+    async def async_record(
+        self,
+        fetched_at: datetime,
+        records: list[dict[str, Any]],
+    ) -> None:
+        """Append a response to the archive."""
+        line = json_bytes({"fetched_at": fetched_at, "stations": records}) + b"\n"
+        async with self._lock:
+            try:
+                written = await async_add_executor_job(
+                    self.hass,
+                    _append,
+                    self.path,
+                    line,
+                )
+            except OSError as err:
+                self.stats.errors += 1
+                LOGGER.warning("Cannot record response to %s: %s", self.path, err)
+                return
+        self.stats.frames += 1
+        self.stats.bytes_written += written
+
+
+class LUNMistoAirReplaySource(LUNMistoAirSource):
+    """
+    Recorded responses fed back one per refresh.
+
+    Refreshes are scheduled by the gaps between recorded responses divided by
+    the speed, so a trace replays in real time or faster. After the last
+    response it keeps being returned on the regular schedule.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        hass: HomeAssistant,
+        path: Path,
+        speed: float,
+    ) -> None:
+        """Initialize the source."""
+        super().__init__(name)
+        self.hass = hass
+        self.path = path
+        self.speed = speed
+        self.position = 0
+        self._frames: list[_Frame] | None = None
+
+    @property
+    def location(self) -> str:
+        """Return the archive path."""
+        return str(self.path)
+
+    @property
+    def frame_count(self) -> int | None:
+        """Return the number of recorded responses, once loaded."""
+        return len(self._frames) if self._frames is not None else None
+
+    @property
+    def next_interval(self) -> timedelta | None:
+        """Return the scaled gap to the next recorded response."""
+        frames = self._frames
+        if not frames or not 0 < self.position < len(frames):
+            return None
+        gap = frames[self.position][0] - frames[self.position - 1][0]
+        return max(gap / self.speed, MIN_REPLAY_INTERVAL)
+
+    @property
+    def captured_at(self) -> datetime | None:
+        """Return when the last replayed response was recorded."""
+        if not self._frames or not self.position:
+            return None
+        return self._frames[min(self.position, len(self._frames)) - 1][0]
+
+    async def async_fetch(
+        self,
+        priority: LUNMistoAirPriority,  # noqa: ARG002
+    ) -> list[dict[str, Any]]:
+        """Return the next recorded response."""
+        if self._frames is None:
+            try:
+                self._frames = await async_add_executor_job(
+                    self.hass,
+                    read_archive,
+                    self.path,
+                )
+            except OSError as err:
+                msg = f"Cannot read {self.path}: {err}"
+                raise LUNMistoAirError(msg) from err
+            except (ValueError, KeyError) as err:
+                msg = f"Invalid archive {self.path}: {err}"
+                raise LUNMistoAirResponseError(msg) from err
+            LOGGER.info("Replaying %d responses from %s", len(self._frames), self.path)
+
+        if not self._frames:
+            msg = f"No recorded responses in {self.path}"
+            raise LUNMistoAirResponseError(msg)
+
+        if self.position == len(self._frames):
+            LOGGER.info("Replay of %s finished", self.path)
+        index = min(self.position, len(self._frames) - 1)
+        self.position = min(self.position + 1, len(self._frames) + 1)
+        return self._frames[index][1]
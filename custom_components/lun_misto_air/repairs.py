@@ -0,0 +1,96 @@
+"""Repairs for LUN Misto Air integration."""
+
+from __future__ import annotations
+
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any
+
+import voluptuous as vol
+from homeassistant.components.repairs import ConfirmRepairFlow, RepairsFlow
+from homeassistant.config_entries import ConfigSubentry
+from homeassistant.const import CONF_NAME
+
+from .const import (
+    CONF_STATION_NAME,
+    CONF_STATION_TYPE,
+    ISSUE_NEW_STATION,
+    STATION_NAME_FORMAT,
+    STATION_TYPE_STATIC,
+    SUBENTRY_TYPE_STATION,
+)
+from .discovery import configured_station_names
+from .manager import async_get_manager
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+    from homeassistant.data_entry_flow import FlowResult
+
+
+class NewStationRepairFlow(RepairsFlow):
+    """Add a discovered station as a static subentry."""
+
+    def __init__(self, entry_id: str, station_name: str) -> None:
+        """Initialize the flow."""
+        self._entry_id = entry_id
+        self._station_name = station_name
+
+    async def async_step_init(
+        self,
+        user_input: dict[str, str] | None = None,  # noqa: ARG002
+    ) -> FlowResult:
+        """Handle the first step of a fix flow."""
+        return await self.async_step_confirm()
+
+    async def async_step_confirm(
+        self,
+        user_input: dict[str, str] | None = None,
+    ) -> FlowResult:
+        """Confirm adding the station."""
+        entry = self.hass.config_entries.async_get_entry(self._entry_id)
+        station = (async_get_manager(self.hass).stations or {}).get(self._station_name)
+
+        if entry is None or station is None:
+            return self.async_abort(reason="station_not_found")
+
+        if self._station_name in configured_station_names(entry):
+            return self.async_create_entry(data={})
+
+        name = STATION_NAME_FORMAT.format(
+            city=station.city.capitalize(),
+            station=station.name,
+        )
+
+        if user_input is not None:
+            self.hass.config_entries.async_add_subentry(
+                entry,
+                ConfigSubentry(
+                    data=MappingProxyType(
+                        {
+                            CONF_NAME: name,
+                            CONF_STATION_TYPE: STATION_TYPE_STATIC,
+                            CONF_STATION_NAME: station.name,
+                        }
+                    ),
+                    subentry_type=SUBENTRY_TYPE_STATION,
+                    title=name,
+                    unique_id=None,
+                ),
+            )
+            return self.async_create_entry(data={})
+
+        return self.async_show_form(
+            step_id="confirm",
+            data_schema=vol.Schema({}),
+            description_placeholders={"name": name},
+        )
+
+
+async def async_create_fix_flow(
+    hass: HomeAssistant,  # noqa: ARG001
+    issue_id: str,
+    data: dict[str, Any] | None,
+) -> RepairsFlow:
+    """Create a fix flow for an issue."""
+    if issue_id.startswith(ISSUE_NEW_STATION) and data:
+        return NewStationRepairFlow(data["entry_id"], data[CONF_STATION_NAME])
+    return ConfirmRepairFlow()
@@ -1,9 +1,13 @@
 """Sensor platform for Lun Misto Air integration."""
 
 import logging
+import time
 from collections.abc import Callable
 from dataclasses import dataclass
 
+from homeassistant.components.sensor import (
+    DOMAIN as SENSOR_DOMAIN,
+)
 from homeassistant.components.sensor import (
     SensorEntity,
     SensorEntityDescription,
@@ -18,50 +22,70 @@ from homeassistant.const import (
     UnitOfPressure,
     UnitOfTemperature,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
 from homeassistant.helpers.typing import StateType
 
 from .api import LUNMistoAirStation
 from .const import (
     ATTR_CITY,
+    ATTR_STALE,
     ATTR_STATION_NAME,
     ATTR_UPDATED,
-    MAX_HUMIDITY,
-    MAX_PRESSURE_PA,
-    MIN_HUMIDITY,
-    MIN_PRESSURE_PA,
+    CONF_COMPACT,
+    CONF_DEADBAND,
+    CONF_SENSORS,
+    DEADBAND_KEY_FORMAT,
+    DEADBAND_MAX_QUIET,
+    SIGNAL_SUBENTRY_ADDED,
     STATION_NAME_FORMAT,
     SUGGESTED_PRECISION,
 )
 from .coordinator import LUNMistoAirCoordinator
 from .data import LUNMistoAirConfigEntry
 from .entity import LUNMistoAirEntity
+from .health import LUNMistoAirHealth
 
 LOGGER = logging.getLogger(__name__)
 
 
-def _weather_block_offline(station: LUNMistoAirStation) -> bool:
-    """Return True when the whole weather block is offline (all zero)."""
-    return station.temperature == 0 and station.humidity == 0 and station.pressure == 0
+@dataclass(frozen=True, slots=True)
+class LUNMistoAirDeadband:
+    """Smallest change of a reading that is worth a state write."""
 
+    value: float
+    relative: bool = False
 
-def _humidity_available(station: LUNMistoAirStation) -> bool:
-    """Return True when humidity is within a plausible range."""
-    return MIN_HUMIDITY < station.humidity <= MAX_HUMIDITY
+    def exceeded(self, old: StateType, new: StateType) -> bool:
+        """Return True if the reading moved past the deadband."""
+        if not isinstance(old, int | float) or not isinstance(new, int | float):
+            return old != new
+        threshold = abs(old) * self.value if self.relative else self.value
+        return new != old and abs(new - old) >= threshold
 
+    @property
+    def display_value(self) -> float:
+        """Return the threshold as shown in the UI, percent when relative."""
+        return self.value * 100 if self.relative else self.value
 
-def _pressure_available(station: LUNMistoAirStation) -> bool:
-    """Return True when pressure is within a plausible range."""
-    return MIN_PRESSURE_PA <= station.pressure <= MAX_PRESSURE_PA
+    def with_display_value(self, value: float) -> "LUNMistoAirDeadband":
+        """Return the deadband with a threshold entered in the UI."""
+        return LUNMistoAirDeadband(
+            value / 100 if self.relative else value,
+            relative=self.relative,
+        )
 
 
 @dataclass(frozen=True, kw_only=True)
 class LUNMistoAirSensorDescription(SensorEntityDescription):
     """Lun Misto Air entity description."""
 
-    available_fn: Callable[[LUNMistoAirStation], bool] = lambda _: True
+    # Health flags the station needs for the reading to be available
+    health: LUNMistoAirHealth = LUNMistoAirHealth.NONE
     value_fn: Callable[[LUNMistoAirStation], StateType]
+    deadband: LUNMistoAirDeadband | None = None
 
 
 SENSOR_TYPES: tuple[LUNMistoAirSensorDescription, ...] = (
@@ -71,7 +95,7 @@ SENSOR_TYPES: tuple[LUNMistoAirSensorDescription, ...] = (
         device_class=SensorDeviceClass.AQI,
         state_class=SensorStateClass.MEASUREMENT,
         value_fn=lambda station: station.aqi,
-        available_fn=lambda station: station.aqi is not None,
+        health=LUNMistoAirHealth.AQI,
     ),
     LUNMistoAirSensorDescription(
         key="pm25",
@@ -81,7 +105,8 @@ SENSOR_TYPES: tuple[LUNMistoAirSensorDescription, ...] = (
         suggested_display_precision=SUGGESTED_PRECISION,
         native_unit_of_measurement=CONCENTRATION_MICROGRAMS_PER_CUBIC_METER,
         value_fn=lambda station: station.avg_pm25,
-        available_fn=lambda station: station.avg_pm25 is not None,
+        health=LUNMistoAirHealth.PM25,
+        deadband=LUNMistoAirDeadband(0.05, relative=True),
     ),
     LUNMistoAirSensorDescription(
         key="pm10",
@@ -91,7 +116,8 @@ SENSOR_TYPES: tuple[LUNMistoAirSensorDescription, ...] = (
         suggested_display_precision=SUGGESTED_PRECISION,
         native_unit_of_measurement=CONCENTRATION_MICROGRAMS_PER_CUBIC_METER,
         value_fn=lambda station: station.avg_pm100,
-        available_fn=lambda station: station.avg_pm100 is not None,
+        health=LUNMistoAirHealth.PM10,
+        deadband=LUNMistoAirDeadband(0.05, relative=True),
     ),
     LUNMistoAirSensorDescription(
         key="pm1",
@@ -101,7 +127,8 @@ SENSOR_TYPES: tuple[LUNMistoAirSensorDescription, ...] = (
         suggested_display_precision=SUGGESTED_PRECISION,
         native_unit_of_measurement=CONCENTRATION_MICROGRAMS_PER_CUBIC_METER,
         value_fn=lambda station: station.avg_pm10,
-        available_fn=lambda station: station.avg_pm10 is not None,
+        health=LUNMistoAirHealth.PM1,
+        deadband=LUNMistoAirDeadband(0.05, relative=True),
     ),
     LUNMistoAirSensorDescription(
         key="temperature",
@@ -111,7 +138,8 @@ SENSOR_TYPES: tuple[LUNMistoAirSensorDescription, ...] = (
         suggested_display_precision=1,
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         value_fn=lambda station: station.temperature,
-        available_fn=lambda station: not _weather_block_offline(station),
+        health=LUNMistoAirHealth.TEMPERATURE,
+        deadband=LUNMistoAirDeadband(0.1),
     ),
     LUNMistoAirSensorDescription(
         key="humidity",
@@ -121,7 +149,8 @@ SENSOR_TYPES: tuple[LUNMistoAirSensorDescription, ...] = (
         suggested_display_precision=0,
         native_unit_of_measurement=PERCENTAGE,
         value_fn=lambda station: station.humidity,
-        available_fn=_humidity_available,
+        health=LUNMistoAirHealth.HUMIDITY,
+        deadband=LUNMistoAirDeadband(0.5),
     ),
     LUNMistoAirSensorDescription(
         key="pressure",
@@ -131,7 +160,8 @@ SENSOR_TYPES: tuple[LUNMistoAirSensorDescription, ...] = (
         suggested_display_precision=1,
         native_unit_of_measurement=UnitOfPressure.HPA,
         value_fn=lambda station: station.pressure / 100,
-        available_fn=_pressure_available,
+        health=LUNMistoAirHealth.PRESSURE,
+        deadband=LUNMistoAirDeadband(0.1),
     ),
     LUNMistoAirSensorDescription(
         key="station",
@@ -141,13 +171,87 @@ SENSOR_TYPES: tuple[LUNMistoAirSensorDescription, ...] = (
             city=station.city.capitalize(),
             station=station.name,
         ),
-        available_fn=lambda station: station.name is not None,
     ),
 )
 
 
+# Single entity exposing every reading of a station in compact mode
+SUMMARY_DESCRIPTION = LUNMistoAirSensorDescription(
+    key="summary",
+    translation_key="summary",
+    device_class=SensorDeviceClass.AQI,
+    state_class=SensorStateClass.MEASUREMENT,
+    value_fn=lambda station: station.aqi,
+    health=LUNMistoAirHealth.AQI,
+)
+
+# Readings that are already the state or attributes of the summary entity
+SUMMARY_EXCLUDED_KEYS = {"aqi", "station"}
+
+
+def _selected_descriptions(
+    coordinator: LUNMistoAirCoordinator,
+) -> list[LUNMistoAirSensorDescription]:
+    """Return descriptions of sensors selected for a subentry."""
+    keys = coordinator.config_subentry.data.get(CONF_SENSORS)
+    return [
+        description
+        for description in SENSOR_TYPES
+        if keys is None or description.key in keys
+    ]
+
+
+def _configured_deadbands(
+    coordinator: LUNMistoAirCoordinator,
+) -> dict[str, LUNMistoAirDeadband]:
+    """Return deadbands of readings, with thresholds set for a subentry."""
+    data = coordinator.config_subentry.data
+    deadbands = {}
+    for description in SENSOR_TYPES:
+        if description.deadband is None:
+            continue
+        value = data.get(DEADBAND_KEY_FORMAT.format(key=description.key))
+        deadbands[description.key] = (
+            description.deadband
+            if value is None
+            else description.deadband.with_display_value(value)
+        )
+    return deadbands
+
+
+def _coordinator_entities(
+    coordinator: LUNMistoAirCoordinator,
+) -> list[SensorEntity]:
+    """Return entities to create for a subentry."""
+    descriptions = _selected_descriptions(coordinator)
+    if coordinator.config_subentry.data.get(CONF_COMPACT):
+        return [LUNMistoAirSummarySensor(coordinator, descriptions)]
+    return [LUNMistoAirSensor(coordinator, description) for description in descriptions]
+
+
+@callback
+def _async_remove_stale_entities(
+    hass: HomeAssistant,
+    config_entry: LUNMistoAirConfigEntry,
+    unique_ids: dict[str, set[str]],
+) -> None:
+    """Remove registry entries no longer created for the given subentries."""
+    entity_registry = er.async_get(hass)
+    for entity_entry in er.async_entries_for_config_entry(
+        entity_registry,
+        config_entry.entry_id,
+    ):
+        wanted = unique_ids.get(entity_entry.config_subentry_id or "")
+        if (
+            wanted is not None
+            and entity_entry.domain == SENSOR_DOMAIN
+            and entity_entry.unique_id not in wanted
+        ):
+            entity_registry.async_remove(entity_entry.entity_id)
+
+
 async def async_setup_entry(
-    hass: HomeAssistant,  # noqa: ARG001
+    hass: HomeAssistant,
     config_entry: LUNMistoAirConfigEntry,
     async_add_entities: AddConfigEntryEntitiesCallback,
 ) -> None:
@@ -157,15 +261,34 @@ async def async_setup_entry(
         config_entry.runtime_data.coordinators
     )
 
-    for subentry_id, coordinator in coordinators.items():
-        async_add_entities(
-            [
-                LUNMistoAirSensor(coordinator, description)
-                for description in SENSOR_TYPES
-            ],
-            update_before_add=True,
-            config_subentry_id=subentry_id,
+    @callback
+    def _async_add_coordinators_entities(
+        *new_coordinators: LUNMistoAirCoordinator,
+    ) -> None:
+        unique_ids: dict[str, set[str]] = {}
+        for coordinator in new_coordinators:
+            subentry_id = coordinator.config_subentry.subentry_id
+            entities = _coordinator_entities(coordinator)
+            unique_ids[subentry_id] = {entity.unique_id or "" for entity in entities}
+            async_add_entities(
+                entities,
+                update_before_add=True,
+                config_subentry_id=subentry_id,
+            )
+
+        # Sensors deselected or folded into the summary entity
+        _async_remove_stale_entities(hass, config_entry, unique_ids)
+
+    _async_add_coordinators_entities(*coordinators.values())
+
+    # Subentries added later are set up without reloading the entry
+    config_entry.async_on_unload(
+        async_dispatcher_connect(
+            hass,
+            SIGNAL_SUBENTRY_ADDED.format(entry_id=config_entry.entry_id),
+            _async_add_coordinators_entities,
         )
+    )
 
 
 class LUNMistoAirSensor(LUNMistoAirEntity, SensorEntity):
@@ -184,6 +307,72 @@ class LUNMistoAirSensor(LUNMistoAirEntity, SensorEntity):
         self._attr_unique_id = (
             f"{coordinator.config_subentry.subentry_id}-{self.entity_description.key}"
         )
+        self._deadband = coordinator.config_subentry.data.get(CONF_DEADBAND, True)
+        self._deadbands = _configured_deadbands(coordinator)
+        self._written_values: dict[str, StateType] | None = None
+        self._written_at = 0.0
+
+    @property
+    def _filtered_descriptions(self) -> list[LUNMistoAirSensorDescription]:
+        """Return descriptions of readings whose changes cause a state write."""
+        return [self.entity_description]
+
+    def _filtered_values(self) -> dict[str, StateType]:
+        """Return current readings compared against the last written ones."""
+        station, health = self.coordinator.data, self.coordinator.health
+        return {
+            # A dynamic station switching to another one is always written
+            ATTR_STATION_NAME: station.name,
+            ATTR_STALE: LUNMistoAirHealth.FRESH not in health,
+            **{
+                description.key: (
+                    description.value_fn(station)
+                    if description.health in health
+                    else None
+                )
+                for description in self._filtered_descriptions
+            },
+        }
+
+    def _within_deadband(self, values: dict[str, StateType]) -> bool:
+        """Return True if no reading moved enough since the last write."""
+        written = self._written_values
+        if not self._deadband or written is None:
+            return False
+        if time.monotonic() - self._written_at >= DEADBAND_MAX_QUIET * 60:
+            return False
+        if any(written[key] != values[key] for key in (ATTR_STATION_NAME, ATTR_STALE)):
+            return False
+        for description in self._filtered_descriptions:
+            old, new = written[description.key], values[description.key]
+            deadband = self._deadbands.get(description.key)
+            if deadband is None:
+                if old != new:
+                    return False
+            elif deadband.exceeded(old, new):
+                return False
+        return True
+
+    def _record_write(self, values: dict[str, StateType]) -> None:
+        """Remember what was written and when."""
+        self._written_values = values
+        self._written_at = time.monotonic()
+
+    async def async_added_to_hass(self) -> None:
+        """Record the initial state written when the entity is added."""
+        await super().async_added_to_hass()
+        self._record_write(self._filtered_values())
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state only when a reading moved past its deadband."""
+        values = self._filtered_values()
+        if self._within_deadband(values):
+            self.coordinator.refresh_stats.record_write(skipped=True)
+            return
+        self._record_write(values)
+        self.coordinator.refresh_stats.record_write()
+        super()._handle_coordinator_update()
 
     @property
     def extra_state_attributes(self) -> dict:
@@ -192,6 +381,7 @@ class LUNMistoAirSensor(LUNMistoAirEntity, SensorEntity):
             ATTR_STATION_NAME: self.coordinator.data.name,
             ATTR_CITY: self.coordinator.data.city.capitalize(),
             ATTR_UPDATED: self.coordinator.data.updated,
+            ATTR_STALE: LUNMistoAirHealth.FRESH not in self.coordinator.health,
             ATTR_LATITUDE: self.coordinator.data.latitude,
             ATTR_LONGITUDE: self.coordinator.data.longitude,
         }
@@ -199,9 +389,47 @@ class LUNMistoAirSensor(LUNMistoAirEntity, SensorEntity):
     @property
     def available(self) -> bool:
         """Check if entity is available."""
-        return self.entity_description.available_fn(self.coordinator.data)
+        return self.entity_description.health in self.coordinator.health
 
     @property
     def native_value(self) -> StateType:
         """Return the state of the sensor."""
         return self.entity_description.value_fn(self.coordinator.data)
+
+
+class LUNMistoAirSummarySensor(LUNMistoAirSensor):
+    """Single sensor of a station with AQI as state and readings as attributes."""
+
+    def __init__(
+        self,
+        coordinator: LUNMistoAirCoordinator,
+        readings: list[LUNMistoAirSensorDescription],
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, SUMMARY_DESCRIPTION)
+        self._readings = [
+            description
+            for description in readings
+            if description.key not in SUMMARY_EXCLUDED_KEYS
+        ]
+
+    @property
+    def _filtered_descriptions(self) -> list[LUNMistoAirSensorDescription]:
+        """Return descriptions of the state and every attribute reading."""
+        return [self.entity_description, *self._readings]
+
+    @property
+    def extra_state_attributes(self) -> dict:
+        """Return the station attributes and the selected readings."""
+        station, health = self.coordinator.data, self.coordinator.health
+        return {
+            **super().extra_state_attributes,
+            **{
+                description.key: (
+                    description.value_fn(station)
+                    if description.health in health
+                    else None
+                )
+                for description in self._readings
+            },
+        }
@@ -0,0 +1,85 @@
+"""Services for LUN Misto Air integration."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import voluptuous as vol
+from homeassistant.core import HomeAssistant, ServiceCall, callback
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.service import async_register_admin_service
+
+from .const import (
+    ATTR_CYCLES,
+    ATTR_FILE,
+    DEFAULT_PROFILE_CYCLES,
+    DEFAULT_PROFILE_FILE,
+    DOMAIN,
+    MAX_PROFILE_CYCLES,
+    SERVICE_PROFILE,
+)
+from .manager import async_get_manager
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CYCLES, default=DEFAULT_PROFILE_CYCLES): vol.All(
+            vol.Coerce(int),
+            vol.Range(min=1, max=MAX_PROFILE_CYCLES),
+        ),
+        vol.Optional(ATTR_FILE, default=DEFAULT_PROFILE_FILE): cv.string,
+    }
+)
+
+
+def _allowed_profile_path(hass: HomeAssistant, file: str) -> Path | None:
+    """Return where a profile may be written, or None; runs in the executor."""
+    # Symlinks and ".." are resolved first, so the check sees the real target
+    path = Path(hass.config.path(file)).resolve()
+    config_dir = Path(hass.config.config_dir).resolve()
+    if path.is_relative_to(config_dir) or hass.config.is_allowed_path(str(path)):
+        return path
+    return None
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register integration services."""
+
+    async def _async_profile(call: ServiceCall) -> None:
+        if not hass.config_entries.async_loaded_entries(DOMAIN):
+            raise ServiceValidationError(
+                translation_domain=DOMAIN,
+                translation_key="not_loaded",
+            )
+
+        manager = async_get_manager(hass)
+        if manager.profiler is not None:
+            raise ServiceValidationError(
+                translation_domain=DOMAIN,
+                translation_key="profiling_active",
+                translation_placeholders={
+                    "completed": str(manager.profiler.completed),
+                    "cycles": str(manager.profiler.cycles),
+                },
+            )
+
+        path = await hass.async_add_executor_job(
+            _allowed_profile_path, hass, call.data[ATTR_FILE]
+        )
+        if path is None:
+            raise ServiceValidationError(
+                translation_domain=DOMAIN,
+                translation_key="invalid_path",
+                translation_placeholders={"file": call.data[ATTR_FILE]},
+            )
+
+        manager.async_start_profiling(call.data[ATTR_CYCLES], path)
+
+    async_register_admin_service(
+        hass,
+        DOMAIN,
+        SERVICE_PROFILE,
+        _async_profile,
+        schema=PROFILE_SCHEMA,
+    )
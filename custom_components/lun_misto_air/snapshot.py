@@ -0,0 +1,281 @@
+"""Snapshot helpers for LUN Misto Air integration."""
+
+from __future__ import annotations
+
+import logging
+import operator
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import TYPE_CHECKING, Any
+
+from .api import RECORD_KEYS, LUNMistoAirStation
+from .const import STALE_AFTER
+from .geo import LUNMistoAirStationIndex, LUNMistoAirStationPoint
+from .health import LUNMistoAirHealth, classify_record
+
+if TYPE_CHECKING:
+    from datetime import datetime
+
+LOGGER = logging.getLogger(__name__)
+
+_RECORD_KEYS = frozenset(RECORD_KEYS.values())
+
+# Station field values of a raw record, in the order of RECORD_KEYS
+type StationRow = tuple[Any, ...]
+_station_row = operator.itemgetter(*RECORD_KEYS.values())
+
+# Reading fields compared between snapshots; "name" is the key itself
+_ROW_FIELDS = tuple(RECORD_KEYS)[1:]
+
+
+class LUNMistoAirStations(Mapping[str, LUNMistoAirStation]):
+    """
+    Stations keyed by name, built from compact rows on first access.
+
+    A refresh only needs the few stations entities are subscribed to, so the
+    rest of the response is kept as tuples of field values and never turned
+    into objects. Raw records are dropped once the rows are taken from them.
+    """
+
+    __slots__ = ("_rows", "_stations")
+
+    def __init__(self, rows: dict[str, StationRow]) -> None:
+        """Initialize the stations."""
+        self._rows = rows
+        self._stations: dict[str, LUNMistoAirStation] = {}
+
+    @property
+    def rows(self) -> Mapping[str, StationRow]:
+        """Return the field values of every station keyed by its name."""
+        return self._rows
+
+    @property
+    def materialized(self) -> int:
+        """Return the number of stations built so far."""
+        return len(self._stations)
+
+    def __getitem__(self, name: str) -> LUNMistoAirStation:
+        """Return a station, building it on first access."""
+        if (station := self._stations.get(name)) is None:
+            station = LUNMistoAirStation(*self._rows[name])
+            self._stations[name] = station
+        return station
+
+    def __contains__(self, name: object) -> bool:
+        """Return True if a station with the name exists."""
+        return name in self._rows
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over station names."""
+        return iter(self._rows)
+
+    def __len__(self) -> int:
+        """Return the number of stations."""
+        return len(self._rows)
+
+    def scan(self) -> Iterator[LUNMistoAirStation]:
+        """Yield every station without keeping the ones not built yet."""
+        for name, row in self._rows.items():
+            yield self._stations.get(name) or LUNMistoAirStation(*row)
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class LUNMistoAirSnapshot:
+    """All stations fetched at once, with indexes built for them."""
+
+    version: int
+    fetched_at: datetime
+    stations: LUNMistoAirStations
+    index: LUNMistoAirStationIndex
+    health: dict[str, LUNMistoAirHealth]
+
+
+def build_snapshot(
+    records: list[Any],
+    *,
+    version: int,
+    fetched_at: datetime,
+    captured_at: datetime | None = None,
+) -> LUNMistoAirSnapshot:
+    """
+    Build a snapshot from raw records, skipping malformed ones.
+
+    Stations are stale relative to when the records were captured, which is
+    the fetch itself unless they come from a recording or a file.
+    """
+    # Stations are built on access; the index only needs coordinates
+    rows: dict[str, StationRow] = {}
+    health: dict[str, LUNMistoAirHealth] = {}
+    stale_before = (captured_at or fetched_at) - timedelta(minutes=STALE_AFTER)
+    skipped = 0
+    for record in records:
+        if not isinstance(record, dict) or not record.keys() >= _RECORD_KEYS:
+            skipped += 1
+            continue
+        rows[record["name"]] = _station_row(record)
+        health[record["name"]] = classify_record(record, stale_before)
+    if skipped:
+        LOGGER.warning("Skipped %d malformed station records", skipped)
+
+    return LUNMistoAirSnapshot(
+        version=version,
+        fetched_at=fetched_at,
+        stations=LUNMistoAirStations(rows),
+        index=LUNMistoAirStationIndex(
+            LUNMistoAirStationPoint(name, latitude, longitude)
+            for name, latitude, longitude, *_ in rows.values()
+        ),
+        health=health,
+    )
+
+
+@dataclass(slots=True)
+class LUNMistoAirSnapshotDiff:
+    """Difference between two consecutive station snapshots."""
+
+    added: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    changed: dict[str, dict[str, Any]] = field(default_factory=dict)
+    initial: bool = False
+
+    @property
+    def topology_changed(self) -> bool:
+        """Return True if stations were added or removed."""
+        return bool(self.added or self.removed)
+
+    @property
+    def station_names(self) -> set[str]:
+        """Return names of all stations affected by the diff."""
+        return {*self.added, *self.removed, *self.changed}
+
+    def as_event_data(self) -> dict[str, Any]:
+        """Return station names only; readings stay off the event bus."""
+        return {
+            "added": self.added,
+            "removed": self.removed,
+            "changed": sorted(self.changed),
+        }
+
+
+@dataclass(slots=True)
+class LUNMistoAirDiffStats:
+    """Running counters of snapshot diffs, reported in diagnostics."""
+
+    diffs: int = 0
+    added: int = 0
+    removed: int = 0
+    changed: int = 0
+    last_added: int = 0
+    last_removed: int = 0
+    last_changed: int = 0
+
+    def record(self, diff: LUNMistoAirSnapshotDiff) -> None:
+        """Account for a diff."""
+        self.diffs += 1
+        self.last_added = len(diff.added)
+        self.last_removed = len(diff.removed)
+        self.last_changed = len(diff.changed)
+        self.added += self.last_added
+        self.removed += self.last_removed
+        self.changed += self.last_changed
+
+
+@dataclass(slots=True)
+class LUNMistoAirRefreshStats:
+    """Cost of delivering snapshot refreshes to entities, reported in diagnostics."""
+
+    refreshes: int = 0
+    state_writes: int = 0
+    skipped_writes: int = 0
+    last_state_writes: int = 0
+    max_state_writes: int = 0
+    last_dispatch_duration: float = 0.0
+    max_dispatch_duration: float = 0.0
+    _cycle_writes: int = 0
+
+    def start_cycle(self) -> None:
+        """Close the counters of the previous refresh."""
+        if self.refreshes:
+            self.last_state_writes = self._cycle_writes
+            self.max_state_writes = max(self.max_state_writes, self._cycle_writes)
+        self.refreshes += 1
+        self._cycle_writes = 0
+
+    def record_dispatch(self, duration: float) -> None:
+        """Account for the time the event loop spent dispatching a refresh."""
+        self.last_dispatch_duration = duration
+        self.max_dispatch_duration = max(self.max_dispatch_duration, duration)
+
+    def record_write(self, *, skipped: bool = False) -> None:
+        """Account for an entity state write, or one skipped as insignificant."""
+        if skipped:
+            self.skipped_writes += 1
+            return
+        self.state_writes += 1
+        self._cycle_writes += 1
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the public counters."""
+        return {
+            "refreshes": self.refreshes,
+            "state_writes": self.state_writes,
+            "skipped_writes": self.skipped_writes,
+            "current_state_writes": self._cycle_writes,
+            "last_state_writes": self.last_state_writes,
+            "max_state_writes": self.max_state_writes,
+            "last_dispatch_duration": self.last_dispatch_duration,
+            "max_dispatch_duration": self.max_dispatch_duration,
+        }
+
+
+def diff_rows(
+    previous: Mapping[str, StationRow] | None,
+    current: Mapping[str, StationRow],
+) -> LUNMistoAirSnapshotDiff:
+    """Compare station rows of two snapshots keyed by station name."""
+    if previous is None:
+        return LUNMistoAirSnapshotDiff(added=sorted(current), initial=True)
+
+    diff = LUNMistoAirSnapshotDiff(
+        added=sorted(current.keys() - previous.keys()),
+        removed=sorted(previous.keys() - current.keys()),
+    )
+
+    for name, row in current.items():
+        old = previous.get(name)
+        if old is None or old == row:
+            continue
+        diff.changed[name] = {
+            attr: value
+            for attr, value, old_value in zip(
+                _ROW_FIELDS, row[1:], old[1:], strict=True
+            )
+            if value != old_value
+        }
+
+    return diff
+
+
+def diff_snapshots(
+    previous: LUNMistoAirSnapshot | None,
+    current: LUNMistoAirSnapshot,
+) -> LUNMistoAirSnapshotDiff:
+    """Compare two snapshots, including stations that went stale."""
+    diff = diff_rows(
+        previous.stations.rows if previous else None,
+        current.stations.rows,
+    )
+    if previous is None:
+        return diff
+
+    # Staleness changes with time alone, while the records stay the same
+    fresh = LUNMistoAirHealth.FRESH
+    for name, health in current.health.items():
+        old = previous.health.get(name)
+        if old is None or name in diff.changed:
+            continue
+        if fresh in old and fresh not in health:
+            diff.changed[name] = {"stale": True}
+
+    return diff
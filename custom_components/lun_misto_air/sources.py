@@ -0,0 +1,303 @@
+"""Data sources of station records for LUN Misto Air integration."""
+
+from __future__ import annotations
+
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.util import dt as dt_util
+from homeassistant.util.json import json_loads
+
+from .api import LUNMistoAirError, LUNMistoAirPriority, LUNMistoAirResponseError
+from .health import newest_update
+from .profiling import async_add_executor_job
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from datetime import datetime, timedelta
+    from pathlib import Path
+
+    from homeassistant.core import HomeAssistant
+
+    from .api import LUNMistoAirApi
+
+LOGGER = logging.getLogger(__name__)
+
+SOURCE_PRIMARY = "primary"
+SOURCE_MIRROR = "mirror"
+SOURCE_FILE = "file"
+SOURCE_REPLAY = "replay"
+
+# Weight of the latest request in the moving average of latency
+LATENCY_SMOOTHING = 0.3
+# Delay before a failed-over source hands control back to a preferred one
+FAILBACK_INTERVAL = 3600  # seconds
+MAX_FAILOVER_HISTORY = 20
+
+
+@dataclass(slots=True)
+class LUNMistoAirSourceStats:
+    """Request counters of a single data source."""
+
+    requests: int = 0
+    errors: int = 0
+    consecutive_errors: int = 0
+    latency: float | None = None
+    last_error: str | None = None
+
+    def record_success(self, latency: float) -> None:
+        """Account for a successful fetch."""
+        self.requests += 1
+        self.consecutive_errors = 0
+        self.latency = (
+            latency
+            if self.latency is None
+            else LATENCY_SMOOTHING * latency + (1 - LATENCY_SMOOTHING) * self.latency
+        )
+
+    def record_error(self, err: Exception) -> None:
+        """Account for a failed fetch."""
+        self.requests += 1
+        self.errors += 1
+        self.consecutive_errors += 1
+        self.last_error = str(err)
+
+
+class LUNMistoAirSource(ABC):
+    """Provider of raw station records, as returned by /air/stations."""
+
+    def __init__(self, name: str) -> None:
+        """Initialize the source."""
+        self.name = name
+        self.stats = LUNMistoAirSourceStats()
+
+    @property
+    @abstractmethod
+    def location(self) -> str:
+        """Return where the records come from."""
+
+    @property
+    def last_latency(self) -> float | None:
+        """Return the duration of the last fetch, if measured by the source."""
+        return None
+
+    @property
+    def next_interval(self) -> timedelta | None:
+        """Return when new records are due, if the source knows better."""
+        return None
+
+    @property
+    def captured_at(self) -> datetime | None:
+        """Return when the last records were captured, unless just fetched live."""
+        return None
+
+    @abstractmethod
+    async def async_fetch(self, priority: LUNMistoAirPriority) -> list[dict[str, Any]]:
+        """Return raw records of all stations."""
+
+
+class LUNMistoAirUrlSource(LUNMistoAirSource):
+    """Records fetched over HTTP from the LUN API or a mirror of it."""
+
+    def __init__(self, name: str, api: LUNMistoAirApi) -> None:
+        """Initialize the source."""
+        super().__init__(name)
+        self.api = api
+
+    @property
+    def location(self) -> str:
+        """Return the endpoint URL."""
+        return self.api.base_url
+
+    @property
+    def last_latency(self) -> float | None:
+        """Return the duration of the last request, excluding rate limiting."""
+        return self.api.last_latency
+
+    async def async_fetch(self, priority: LUNMistoAirPriority) -> list[dict[str, Any]]:
+        """Return raw records of all stations."""
+        return await self.api.get_raw_stations(priority)
+
+
+class LUNMistoAirFileSource(LUNMistoAirSource):
+    """Records read from a JSON file, for offline use and replay."""
+
+    def __init__(self, name: str, hass: HomeAssistant, path: Path) -> None:
+        """Initialize the source."""
+        super().__init__(name)
+        self.hass = hass
+        self.path = path
+        self._captured_at: datetime | None = None
+
+    @property
+    def location(self) -> str:
+        """Return the file path."""
+        return str(self.path)
+
+    @property
+    def captured_at(self) -> datetime | None:
+        """Return when the most recently reporting station in the file reported."""
+        return self._captured_at
+
+    async def async_fetch(
+        self,
+        priority: LUNMistoAirPriority,  # noqa: ARG002
+    ) -> list[dict[str, Any]]:
+        """Return raw records of all stations."""
+        try:
+            content = await async_add_executor_job(self.hass, self.path.read_bytes)
+        except OSError as err:
+            msg = f"Cannot read {self.path}: {err}"
+            raise LUNMistoAirError(msg) from err
+
+        try:
+            data = json_loads(content)
+        except ValueError as err:
+            msg = f"Invalid JSON in {self.path}: {err}"
+            raise LUNMistoAirResponseError(msg) from err
+
+        if not isinstance(data, list):
+            msg = f"Unexpected content of {self.path}: {type(data).__name__}"
+            raise LUNMistoAirResponseError(msg)
+        # A dump has no clock of its own, so staleness is relative to its newest reading
+        self._captured_at = newest_update(data)
+        return data
+
+
+class LUNMistoAirFailoverSource:
+    """
+    Ordered list of sources with automatic failover.
+
+    The active source is used until it fails too many times in a row or gets
+    slower than the latency threshold; the next source in order then takes
+    over. A failing request is retried on the remaining sources right away,
+    and preferred sources are tried again once the failback interval passed.
+    """
+
+    def __init__(
+        self,
+        sources: Sequence[LUNMistoAirSource],
+        latency_threshold: float,
+        error_threshold: int,
+    ) -> None:
+        """Initialize the failover source."""
+        self.sources = list(sources)
+        self.latency_threshold = latency_threshold
+        self.error_threshold = error_threshold
+        self.failovers: deque[dict[str, Any]] = deque(maxlen=MAX_FAILOVER_HISTORY)
+        self._active = 0
+        self._fetched_from: LUNMistoAirSource | None = None
+        self._switched_at = time.monotonic()
+
+    @property
+    def active(self) -> LUNMistoAirSource:
+        """Return the source currently preferred."""
+        return self.sources[self._active]
+
+    @property
+    def next_interval(self) -> timedelta | None:
+        """Return when the active source has new records, if it knows."""
+        return self.active.next_interval
+
+    @property
+    def captured_at(self) -> datetime | None:
+        """Return when the last records were captured by the source they came from."""
+        return self._fetched_from.captured_at if self._fetched_from else None
+
+    def _switch(self, index: int, reason: str) -> None:
+        """Make another source the active one and record why."""
+        if index == self._active:
+            return
+        LOGGER.warning(
+            "Switching station data source from %s to %s: %s",
+            self.active.name,
+            self.sources[index].name,
+            reason,
+        )
+        self.failovers.append(
+            {
+                "at": dt_util.utcnow().isoformat(),
+                "from": self.active.name,
+                "to": self.sources[index].name,
+                "reason": reason,
+            }
+        )
+        self._active = index
+        self._switched_at = time.monotonic()
+
+    def _order(self) -> list[int]:
+        """Return indexes of sources in the order they should be tried."""
+        if self._active and time.monotonic() - self._switched_at >= FAILBACK_INTERVAL:
+            # Try preferred sources again; wait another interval if they fail
+            self._switched_at = time.monotonic()
+            return list(range(len(self.sources)))
+        return [self._active] + [
+            index for index in range(len(self.sources)) if index != self._active
+        ]
+
+    async def async_fetch(self, priority: LUNMistoAirPriority) -> list[dict[str, Any]]:
+        """Return raw records of all stations from the first source that works."""
+        last_error: LUNMistoAirError | None = None
+
+        for index in self._order():
+            source = self.sources[index]
+            start = time.monotonic()
+            try:
+                data = await source.async_fetch(priority)
+            except LUNMistoAirError as err:
+                LOGGER.debug("Fetching from %s failed: %s", source.name, err)
+                source.stats.record_error(err)
+                last_error = err
+                continue
+
+            latency = source.last_latency
+            source.stats.record_success(
+                latency if latency is not None else time.monotonic() - start
+            )
+            self._select(index)
+            self._fetched_from = source
+            return data
+
+        if last_error is None:
+            msg = "No data sources configured"
+            raise LUNMistoAirError(msg)
+        raise last_error
+
+    def _select(self, index: int) -> None:
+        """Update the active source after a successful fetch from index."""
+        stats = self.sources[index].stats
+        slow = stats.latency is not None and stats.latency > self.latency_threshold
+
+        if index < self._active:
+            if not slow:
+                self._switch(index, "preferred source recovered")
+        elif index > self._active:
+            errors = self.active.stats.consecutive_errors
+            if errors >= self.error_threshold:
+                self._switch(index, f"{errors} consecutive errors")
+        elif slow and index + 1 < len(self.sources):
+            self._switch(
+                index + 1,
+                f"latency {stats.latency:.1f}s above {self.latency_threshold:.1f}s",
+            )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the sources, their counters and failover history."""
+        return {
+            "active": self.active.name,
+            "latency_threshold": self.latency_threshold,
+            "error_threshold": self.error_threshold,
+            "sources": [
+                {
+                    "name": source.name,
+                    "location": source.location,
+                    **asdict(source.stats),
+                }
+                for source in self.sources
+            ],
+            "failovers": list(self.failovers),
+        }
@@ -0,0 +1,209 @@
+"""HTTP views for LUN Misto Air integration."""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import logging
+from dataclasses import dataclass
+from http import HTTPStatus
+from typing import TYPE_CHECKING, Any
+
+from aiohttp import hdrs, web
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.http import KEY_HASS
+from homeassistant.helpers.json import json_bytes
+from homeassistant.util.hass_dict import HassKey
+
+from .const import DOMAIN, STATION_NAME_FORMAT
+
+if TYPE_CHECKING:
+    from .manager import LUNMistoAirSnapshotManager
+    from .snapshot import LUNMistoAirSnapshot
+
+LOGGER = logging.getLogger(__name__)
+
+DATA_STATIONS_VIEW: HassKey[LUNMistoAirStationsView] = HassKey(
+    f"{DOMAIN}_stations_view"
+)
+
+GEOJSON_CONTENT_TYPE = "application/geo+json"
+GZIP_LEVEL = 6
+# If-None-Match value that matches any version
+ETAG_ANY = "*"
+GZIP_CODINGS = ("gzip", "x-gzip")
+
+
+@dataclass(frozen=True, slots=True)
+class _GeoJSONPayload:
+    """Serialized GeoJSON of a single snapshot version."""
+
+    version: int
+    etag: str
+    body: bytes
+    gzipped: bytes
+
+
+def build_geojson(snapshot: LUNMistoAirSnapshot) -> dict[str, Any]:
+    """Return all stations of a snapshot as a GeoJSON FeatureCollection."""
+    return {
+        "type": "FeatureCollection",
+        "features": [
+            {
+                "type": "Feature",
+                "geometry": {
+                    "type": "Point",
+                    "coordinates": [station.longitude, station.latitude],
+                },
+                "properties": {
+                    "name": station.name,
+                    "city": station.city,
+                    "title": STATION_NAME_FORMAT.format(
+                        city=station.city.capitalize(),
+                        station=station.name,
+                    ),
+                    "aqi": station.aqi,
+                    "pm1": station.avg_pm10,
+                    "pm25": station.avg_pm25,
+                    "pm10": station.avg_pm100,
+                    "temperature": station.temperature,
+                    "humidity": station.humidity,
+                    "pressure": station.pressure / 100,
+                    "updated": station.updated,
+                },
+            }
+            for station in snapshot.stations.scan()
+        ],
+    }
+
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    """Return True if an Accept-Encoding value allows gzip, honoring q-values."""
+    qualities: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, *params = (part.strip() for part in item.split(";"))
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding.lower()] = quality
+    # Codings named explicitly take precedence over the wildcard
+    if explicit := [
+        qualities[coding] for coding in GZIP_CODINGS if coding in qualities
+    ]:
+        return max(explicit) > 0
+    return qualities.get("*", 0.0) > 0
+
+
+def _serialize(snapshot: LUNMistoAirSnapshot) -> _GeoJSONPayload:
+    """Serialize and compress a snapshot; runs in the executor."""
+    body = json_bytes(build_geojson(snapshot))
+    return _GeoJSONPayload(
+        version=snapshot.version,
+        etag=f'"{int(snapshot.fetched_at.timestamp())}-{snapshot.version}"',
+        body=body,
+        gzipped=gzip.compress(body, compresslevel=GZIP_LEVEL),
+    )
+
+
+class LUNMistoAirStationsView(HomeAssistantView):
+    """Serve the current snapshot of all stations as GeoJSON."""
+
+    url = f"/api/{DOMAIN}/stations.geojson"
+    name = f"api:{DOMAIN}:stations"
+
+    def __init__(self, manager: LUNMistoAirSnapshotManager) -> None:
+        """Initialize the view."""
+        self._manager = manager
+        self._payload: _GeoJSONPayload | None = None
+        self._pending: asyncio.Future[_GeoJSONPayload] | None = None
+        self._pending_version: int | None = None
+
+    @property
+    def cache_size(self) -> int:
+        """Return bytes held by the cached payload."""
+        if self._payload is None:
+            return 0
+        return len(self._payload.body) + len(self._payload.gzipped)
+
+    async def _async_get_payload(
+        self,
+        hass: HomeAssistant,
+        snapshot: LUNMistoAirSnapshot,
+    ) -> _GeoJSONPayload:
+        """Return the payload of a snapshot, serializing it at most once."""
+        if self._payload is not None and self._payload.version == snapshot.version:
+            return self._payload
+
+        # Concurrent requests for a new version share a single serialization
+        if self._pending is None or self._pending_version != snapshot.version:
+            self._pending_version = snapshot.version
+            self._pending = hass.async_add_executor_job(_serialize, snapshot)
+        pending = self._pending
+        try:
+            payload = await asyncio.shield(pending)
+        except Exception:
+            # Let the next request serialize again instead of failing the same way
+            if self._pending is pending:
+                self._pending = None
+                self._pending_version = None
+            raise
+
+        if self._payload is None or payload.version > self._payload.version:
+            self._payload = payload
+        return payload
+
+    async def get(self, request: web.Request) -> web.Response:
+        """Return the GeoJSON of all stations."""
+        if (snapshot := self._manager.snapshot) is None:
+            return self.json_message(
+                "No station data available",
+                HTTPStatus.SERVICE_UNAVAILABLE,
+            )
+
+        hass: HomeAssistant = request.app[KEY_HASS]
+        payload = await self._async_get_payload(hass, snapshot)
+        headers = {
+            hdrs.ETAG: payload.etag,
+            hdrs.CACHE_CONTROL: "no-cache",
+            hdrs.VARY: hdrs.ACCEPT_ENCODING,
+        }
+
+        if_none_match = request.if_none_match or ()
+        if any(
+            etag.value in (ETAG_ANY, payload.etag.strip('"')) for etag in if_none_match
+        ):
+            return web.Response(status=HTTPStatus.NOT_MODIFIED, headers=headers)
+
+        accept_encoding = ",".join(request.headers.getall(hdrs.ACCEPT_ENCODING, ()))
+        if accepts_gzip(accept_encoding):
+            headers[hdrs.CONTENT_ENCODING] = "gzip"
+            body = payload.gzipped
+        else:
+            body = payload.body
+
+        return web.Response(
+            body=body,
+            content_type=GEOJSON_CONTENT_TYPE,
+            headers=headers,
+        )
+
+
+@callback
+def async_register_views(
+    hass: HomeAssistant,
+    manager: LUNMistoAirSnapshotManager,
+) -> None:
+    """Register HTTP views once; views cannot be unregistered."""
+    if DATA_STATIONS_VIEW in hass.data:
+        return
+    view = LUNMistoAirStationsView(manager)
+    hass.http.register_view(view)
+    hass.data[DATA_STATIONS_VIEW] = view
@@ -0,0 +1 @@
+"""Tests for LUN Misto Air integration."""
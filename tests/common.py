@@ -0,0 +1,40 @@
+"""Helpers shared by LUN Misto Air tests."""
+
+from __future__ import annotations
+
+import random
+from datetime import datetime, timedelta
+from typing import Any
+
+# Center of the synthetic stations, spread over roughly 50 by 70 km
+LATITUDE = 50.45
+LONGITUDE = 30.52
+SPREAD = 0.5
+
+
+def make_records(
+    count: int,
+    updated: datetime | None = None,
+    seed: int = 0,
+) -> list[dict[str, Any]]:
+    """Return raw /air/stations records of synthetic stations."""
+    rng = random.Random(seed)
+    updated = updated or datetime.fromisoformat("2026-10-19T12:00:00+00:00")
+    return [
+        {
+            "name": f"Station {number}",
+            "lat": LATITUDE + rng.uniform(-SPREAD, SPREAD) / 2,
+            "lng": LONGITUDE + rng.uniform(-SPREAD, SPREAD),
+            "city": "kyiv",
+            "aqi": rng.randint(0, 200),
+            "avgPm10": round(rng.uniform(0, 50), 2),
+            "avgPm25": round(rng.uniform(0, 80), 2),
+            "avgPm100": round(rng.uniform(0, 120), 2),
+            # Parsed JSON holds a separate string per record
+            "updated": (updated - timedelta(seconds=number % 600)).isoformat(),
+            "temperature": round(rng.uniform(-10, 30), 1),
+            "humidity": round(rng.uniform(20, 95), 1),
+            "pressure": round(rng.uniform(98_000, 103_000)),
+        }
+        for number in range(count)
+    ]
@@ -0,0 +1,165 @@
+"""Fixtures for LUN Misto Air tests."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+from unittest.mock import patch
+
+import pytest
+from aiohttp import web
+from homeassistant.config_entries import ConfigSubentryData
+from homeassistant.const import CONF_NAME
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.lun_misto_air.api import LUNMistoAirApi, LUNMistoAirRateLimiter
+from custom_components.lun_misto_air.const import (
+    CONF_STATION_NAME,
+    CONF_STATION_TYPE,
+    DOMAIN,
+    NAME,
+    STATION_TYPE_STATIC,
+    SUBENTRY_TYPE_STATION,
+)
+
+from .common import make_records
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator
+
+    from _pytest.terminal import TerminalReporter
+    from homeassistant.core import HomeAssistant
+
+STATIONS_PATH = "/api/v1/air/stations"
+STATION_COUNT = 1_000
+# Tokens of the rate limiter, entries may lower them with their options
+REQUEST_BURST = 10
+
+# Results of the scaling tests, reported at the end of the session
+SCALE_REPORT = pytest.StashKey[list[dict[str, Any]]]()
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    """Add an option to write the scaling report to a file."""
+    parser.addoption(
+        "--scale-report",
+        metavar="PATH",
+        help="Write results of the scaling tests as JSON to PATH",
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    """Collect results of the scaling tests."""
+    config.stash[SCALE_REPORT] = []
+
+
+def pytest_terminal_summary(
+    terminalreporter: TerminalReporter,
+    config: pytest.Config,
+) -> None:
+    """Report results of the scaling tests."""
+    results = sorted(config.stash[SCALE_REPORT], key=lambda row: row["subentries"])
+    if not results:
+        return
+
+    terminalreporter.section("LUN Misto Air scaling")
+    columns = list(results[0])
+    terminalreporter.write_line("  ".join(f"{column:>18}" for column in columns))
+    for row in results:
+        terminalreporter.write_line(
+            "  ".join(
+                f"{value:>18.4f}" if isinstance(value, float) else f"{value:>18}"
+                for value in row.values()
+            )
+        )
+
+    if path := config.getoption("--scale-report"):
+        Path(path).write_text(json.dumps(results, indent=2), encoding="utf-8")
+        terminalreporter.write_line(f"Written to {path}")
+
+
+@pytest.fixture
+def scale_report(request: pytest.FixtureRequest) -> list[dict[str, Any]]:
+    """Return the list results of the scaling tests are appended to."""
+    return request.config.stash[SCALE_REPORT]
+
+
+class FakeLUNMistoAirApi:
+    """Local HTTP server standing in for the LUN /air/stations endpoint."""
+
+    def __init__(self, records: list[dict[str, Any]]) -> None:
+        """Initialize the fake API."""
+        self.records = records
+        self.requests = 0
+
+    async def handle_stations(self, _request: web.Request) -> web.Response:
+        """Return all station records."""
+        self.requests += 1
+        response = web.json_response(self.records)
+        # Compressed like the real API when the client accepts it
+        response.enable_compression()
+        return response
+
+
+@pytest.fixture
+async def fake_api(socket_enabled: None) -> AsyncGenerator[FakeLUNMistoAirApi]:
+    """Serve synthetic stations locally and point the API client at them."""
+    api = FakeLUNMistoAirApi(make_records(STATION_COUNT))
+    app = web.Application()
+    app.router.add_get(STATIONS_PATH, api.handle_stations)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    host, port = runner.addresses[0][:2]
+
+    # The default limiter is shared by every API client, so it outlives tests
+    with (
+        patch.object(
+            LUNMistoAirApi, "base_url", f"http://{host}:{port}{STATIONS_PATH}"
+        ),
+        patch(
+            "custom_components.lun_misto_air.api.RATE_LIMITER",
+            LUNMistoAirRateLimiter(burst=REQUEST_BURST),
+        ),
+    ):
+        yield api
+
+    await runner.cleanup()
+
+
+async def async_setup_station_entry(hass: HomeAssistant) -> MockConfigEntry:
+    """Set up an entry with a single station."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title=NAME,
+        version=3,
+        data={},
+        subentries_data=[
+            ConfigSubentryData(
+                data={
+                    CONF_NAME: "Station 1",
+                    CONF_STATION_TYPE: STATION_TYPE_STATIC,
+                    CONF_STATION_NAME: "Station 1",
+                },
+                subentry_type=SUBENTRY_TYPE_STATION,
+                title="Station 1",
+                unique_id="Station 1",
+            )
+        ],
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return entry
+
+
+@pytest.fixture
+async def loaded_entry(
+    hass: HomeAssistant,
+    enable_custom_integrations: None,
+    fake_api: FakeLUNMistoAirApi,
+) -> MockConfigEntry:
+    """Set up an entry with a single station."""
+    return await async_setup_station_entry(hass)
@@ -0,0 +1,57 @@
+"""Tests for discovery of new LUN Misto Air stations."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+from homeassistant.helpers import issue_registry as ir
+
+from custom_components.lun_misto_air.const import (
+    DEFAULT_DISCOVERY_RADIUS,
+    DOMAIN,
+    ISSUE_NEW_STATION,
+)
+from custom_components.lun_misto_air.discovery import new_station_issue_id
+from custom_components.lun_misto_air.manager import async_get_manager
+
+from .common import LATITUDE, LONGITUDE
+from .conftest import async_setup_station_entry
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from .conftest import FakeLUNMistoAirApi
+
+
+@pytest.mark.usefixtures("enable_custom_integrations")
+async def test_propose_stations_on_setup(
+    hass: HomeAssistant,
+    fake_api: FakeLUNMistoAirApi,
+    issue_registry: ir.IssueRegistry,
+) -> None:
+    """Test stations near home are proposed when the integration starts."""
+    hass.config.latitude, hass.config.longitude = LATITUDE, LONGITUDE
+    await async_setup_station_entry(hass)
+
+    snapshot = async_get_manager(hass).snapshot
+    assert snapshot is not None
+    nearby = {
+        point.name
+        for _, point in snapshot.index.within(
+            LATITUDE, LONGITUDE, DEFAULT_DISCOVERY_RADIUS * 1000
+        )
+    }
+    # The configured station is not proposed again
+    nearby.discard("Station 1")
+    assert nearby
+
+    issues = [
+        issue
+        for issue in issue_registry.issues.values()
+        if issue.domain == DOMAIN and issue.translation_key == ISSUE_NEW_STATION
+    ]
+    assert {issue.issue_id for issue in issues} == {
+        new_station_issue_id(name) for name in nearby
+    }
+    assert all(issue.severity is ir.IssueSeverity.WARNING for issue in issues)
@@ -0,0 +1,109 @@
+"""Tests for the LUN Misto Air readings export."""
+
+from __future__ import annotations
+
+import sqlite3
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING
+
+import pytest
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+
+from custom_components.lun_misto_air.export import (
+    LUNMistoAirExporter,
+    _reading,
+    _write,
+)
+from custom_components.lun_misto_air.health import newest_update
+from custom_components.lun_misto_air.manager import async_get_manager
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from homeassistant.core import HomeAssistant
+
+    from .conftest import FakeLUNMistoAirApi
+
+FETCHED_TS = 1_792_400_000
+TIME_ZONE = "Europe/Kyiv"
+# Readings of a station row and the same readings as exported
+READINGS = (42, 5.0, 8.0, 12.0)
+WEATHER = (15.5, 60.0, 101_300)
+EXPORTED = (42, 5.0, 8.0, 12.0, 15.5, 60.0, 1013.0)
+
+
+def _row(
+    updated: object = None,
+    city: str = "kyiv",
+    latitude: float = 50.45,
+    longitude: float = 30.52,
+) -> tuple[object, ...]:
+    """Return a station row in the order of RECORD_KEYS."""
+    return ("Station 1", latitude, longitude, city, *READINGS, updated, *WEATHER)
+
+
+@pytest.mark.parametrize("updated", [None, 1_792_399_000, "not a timestamp"])
+def test_reading_without_timestamp(updated: object) -> None:
+    """Test readings without a parsable timestamp are timed by the fetch."""
+    assert _reading(1, _row(updated), FETCHED_TS) == (1, FETCHED_TS, *EXPORTED)
+
+
+async def test_reading_naive_timestamp(hass: HomeAssistant) -> None:
+    """Test naive timestamps are read in the configured time zone, as for health."""
+    await hass.config.async_set_time_zone(TIME_ZONE)
+    updated = "2026-10-19T12:00:00"
+    reported_at = newest_update([{"updated": updated}])
+    assert reported_at is not None
+    assert reported_at == datetime.fromisoformat(f"{updated}+03:00")
+    assert _reading(1, _row(updated), FETCHED_TS) == (
+        1,
+        int(reported_at.timestamp()),
+        *EXPORTED,
+    )
+
+
+async def test_flush_on_stop(
+    hass: HomeAssistant,
+    fake_api: FakeLUNMistoAirApi,
+    tmp_path: Path,
+) -> None:
+    """Test buffered readings are written when Home Assistant stops."""
+    manager = async_get_manager(hass)
+    await manager.async_fetch()
+    path = tmp_path / "export.db"
+    exporter = LUNMistoAirExporter(hass, path, [], timedelta(days=1))
+    stop = exporter.async_start(manager)
+    assert exporter.buffered == len(fake_api.records)
+    # Readings are exported from the compact rows, without building stations
+    assert manager.snapshot is not None
+    assert manager.snapshot.stations.materialized == 0
+
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_STOP)
+    await hass.async_block_till_done()
+
+    assert exporter.buffered == 0
+    assert exporter.stats.errors == 0
+    with sqlite3.connect(path) as connection:
+        (count,) = connection.execute("SELECT COUNT(*) FROM readings").fetchone()
+    assert count == len(fake_api.records)
+    stop()
+
+
+def test_station_moved(tmp_path: Path) -> None:
+    """Test station metadata follows the latest exported rows."""
+    path = tmp_path / "export.db"
+    _write(path, [(FETCHED_TS, [_row()])], None)
+    _write(
+        path,
+        [
+            (FETCHED_TS + 1, [_row()]),
+            (FETCHED_TS + 2, [_row(city="lviv", latitude=49.84, longitude=24.03)]),
+        ],
+        None,
+    )
+
+    with sqlite3.connect(path) as connection:
+        stations = connection.execute(
+            "SELECT name, city, latitude, longitude FROM stations"
+        ).fetchall()
+    assert stations == [("Station 1", "lviv", 49.84, 24.03)]
@@ -0,0 +1,56 @@
+"""Tests for LUN Misto Air station health."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+
+from homeassistant.util import dt as dt_util
+
+from custom_components.lun_misto_air.const import STALE_AFTER
+from custom_components.lun_misto_air.health import LUNMistoAirHealth, newest_update
+from custom_components.lun_misto_air.snapshot import build_snapshot
+
+from .common import make_records
+
+RECORDED_AT = dt_util.parse_datetime("2026-01-10T08:00:00+00:00")
+
+
+def test_stale_relative_to_fetch() -> None:
+    """Test live records are stale relative to when they were fetched."""
+    records = make_records(2, updated=RECORDED_AT)
+
+    snapshot = build_snapshot(records, version=1, fetched_at=dt_util.utcnow())
+
+    assert all(
+        LUNMistoAirHealth.FRESH not in health for health in snapshot.health.values()
+    )
+
+
+def test_stale_relative_to_capture() -> None:
+    """Test replayed and file records are stale relative to their capture."""
+    records = make_records(2, updated=RECORDED_AT)
+    records[1]["updated"] = (
+        RECORDED_AT - timedelta(minutes=STALE_AFTER + 1)
+    ).isoformat()
+
+    snapshot = build_snapshot(
+        records,
+        version=1,
+        fetched_at=dt_util.utcnow(),
+        captured_at=newest_update(records),
+    )
+
+    assert newest_update(records) == RECORDED_AT
+    assert LUNMistoAirHealth.FRESH in snapshot.health["Station 0"]
+    assert LUNMistoAirHealth.FRESH not in snapshot.health["Station 1"]
+
+
+def test_newest_update_skips_unparsable() -> None:
+    """Test records without a parsable timestamp are ignored."""
+    records = make_records(3, updated=RECORDED_AT)
+    records[0]["updated"] = None
+    records[1]["updated"] = "not a timestamp"
+
+    assert newest_update([*records, "not a record"]) == dt_util.parse_datetime(
+        records[2]["updated"]
+    )
@@ -0,0 +1,84 @@
+"""Tests for the LUN Misto Air snapshot manager."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from custom_components.lun_misto_air.api import (
+    LUNMistoAirPriority,
+    LUNMistoAirRateLimiter,
+)
+from custom_components.lun_misto_air.manager import async_get_manager
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from .conftest import FakeLUNMistoAirApi
+
+
+# Slow enough that a fetch completes well before the next token
+TOKEN_RATE = 2  # tokens per second
+# The other request and the fetch
+QUEUED = 2
+
+
+async def test_fetch_before_sources_configured(
+    hass: HomeAssistant,
+    fake_api: FakeLUNMistoAirApi,
+) -> None:
+    """Test config flows and migrations can fetch before an entry is set up."""
+    manager = async_get_manager(hass)
+
+    station = await manager.async_get_station("Station 1")
+
+    assert station.name == "Station 1"
+    assert manager.recorder is None
+    assert fake_api.requests == 1
+
+
+async def test_fetch_through_home_assistant_session(
+    hass: HomeAssistant,
+    fake_api: FakeLUNMistoAirApi,
+) -> None:
+    """Test stations are fetched on the connector of Home Assistant."""
+    manager = async_get_manager(hass)
+
+    snapshot = await manager.async_fetch()
+
+    assert len(snapshot.stations) == len(fake_api.records)
+    session = manager.transport.session
+    assert session.connector is async_get_clientsession(hass).connector
+    stats = manager.transport.stats
+    assert stats.responses == stats.compressed_responses == 1
+    assert 0 < stats.wire_bytes < stats.decoded_bytes
+
+
+async def test_joining_refresh_raises_priority(
+    hass: HomeAssistant,
+    fake_api: FakeLUNMistoAirApi,
+) -> None:
+    """Test a refresh joining a queued interactive fetch moves it ahead."""
+    manager = async_get_manager(hass)
+    limiter = manager.api.rate_limiter = LUNMistoAirRateLimiter(
+        rate=TOKEN_RATE, burst=1
+    )
+    await limiter.acquire()
+    # Another interactive request is queued first
+    other = hass.async_create_task(limiter.acquire(LUNMistoAirPriority.INTERACTIVE))
+    await asyncio.sleep(0)
+
+    interactive = hass.async_create_task(
+        manager.async_fetch(LUNMistoAirPriority.INTERACTIVE)
+    )
+    await asyncio.sleep(0)
+    assert limiter.queue_length == QUEUED
+    await manager.async_fetch(LUNMistoAirPriority.REFRESH)
+    await interactive
+
+    assert fake_api.requests == 1
+    # The next token goes to the other request
+    assert not other.done()
+    await other
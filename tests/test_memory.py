@@ -0,0 +1,72 @@
+"""Memory budgets of LUN Misto Air snapshots."""
+
+from __future__ import annotations
+
+import pytest
+from homeassistant.util import dt as dt_util
+
+from custom_components.lun_misto_air.memory import deep_sizeof
+from custom_components.lun_misto_air.snapshot import build_snapshot
+
+from .common import make_records
+
+# Bytes per station, with some headroom over what is measured today
+SNAPSHOT_BUDGET = 640
+INDEX_BUDGET = 128
+STATION_BUDGET = 512
+
+COUNTS = [1_000, 10_000]
+
+
+@pytest.mark.parametrize("count", COUNTS)
+def test_snapshot_budget(count: int) -> None:
+    """Test a snapshot of all stations stays within its budget."""
+    snapshot = build_snapshot(
+        make_records(count),
+        version=1,
+        fetched_at=dt_util.utcnow(),
+    )
+
+    assert len(snapshot.stations) == count
+    assert deep_sizeof(snapshot) <= count * SNAPSHOT_BUDGET
+
+
+@pytest.mark.parametrize("count", COUNTS)
+def test_index_budget(count: int) -> None:
+    """Test the location index stays within its budget."""
+    snapshot = build_snapshot(
+        make_records(count),
+        version=1,
+        fetched_at=dt_util.utcnow(),
+    )
+    # Names and coordinates shared with the stations are counted with them
+    seen: set[int] = set()
+    deep_sizeof(snapshot.stations, seen)
+
+    assert deep_sizeof(snapshot.index, seen) <= count * INDEX_BUDGET
+
+
+@pytest.mark.parametrize("count", COUNTS)
+def test_station_budget(count: int) -> None:
+    """Test stations built for entities stay within their budget."""
+    snapshot = build_snapshot(
+        make_records(count),
+        version=1,
+        fetched_at=dt_util.utcnow(),
+    )
+    stations = [snapshot.stations[name] for name in snapshot.stations]
+
+    assert deep_sizeof(stations) <= count * STATION_BUDGET
+
+
+def test_stations_built_on_access() -> None:
+    """Test building a snapshot does not build station objects."""
+    snapshot = build_snapshot(
+        make_records(1_000),
+        version=1,
+        fetched_at=dt_util.utcnow(),
+    )
+    assert snapshot.stations.materialized == 0
+
+    snapshot.stations.get("Station 1")
+    assert snapshot.stations.materialized == 1
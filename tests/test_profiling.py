@@ -0,0 +1,94 @@
+"""Tests for profiling of LUN Misto Air refreshes."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import TYPE_CHECKING
+
+import pytest
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.lun_misto_air.const import (
+    ATTR_CYCLES,
+    ATTR_FILE,
+    DOMAIN,
+    SERVICE_PROFILE,
+    UPDATE_INTERVAL,
+)
+from custom_components.lun_misto_air.manager import async_get_manager
+from custom_components.lun_misto_air.profiling import (
+    DATA_PROFILER,
+    STAGE_BUILD,
+    STAGE_DIFF,
+    STAGE_DISPATCH,
+    STAGE_FETCH,
+    LUNMistoAirProfiler,
+    async_add_executor_job,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from homeassistant.core import HomeAssistant
+
+
+# Jobs run while profiling, each summing the same numbers
+JOBS = 3
+NUMBERS = [1, 2, 3]
+
+
+def _fail() -> None:
+    msg = "Job failed"
+    raise OSError(msg)
+
+
+@pytest.mark.usefixtures("loaded_entry")
+async def test_profile_refreshes(hass: HomeAssistant, tmp_path: Path) -> None:
+    """Test only the stages of the integration are profiled."""
+    hass.config.allowlist_external_dirs = {str(tmp_path)}
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_PROFILE,
+        {ATTR_CYCLES: 1, ATTR_FILE: str(tmp_path / "profile.json")},
+        blocking=True,
+    )
+
+    async_fire_time_changed(
+        hass,
+        dt_util.utcnow() + timedelta(minutes=UPDATE_INTERVAL, seconds=1),
+    )
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    manager = async_get_manager(hass)
+    summary = manager.profile_summary
+    assert manager.profiler is None
+    assert summary is not None
+    assert summary["cycles"] == 1
+    assert set(summary["stages"]) == {
+        STAGE_FETCH,
+        STAGE_BUILD,
+        STAGE_DIFF,
+        STAGE_DISPATCH,
+    }
+    functions = [entry["function"] for entry in summary["hot_functions"]]
+    assert any("build_snapshot" in function for function in functions)
+    # Waiting for the network is timed, but not profiled
+    assert not any("aiohttp" in function for function in functions)
+    assert (tmp_path / "profile.json").is_file()
+
+
+async def test_executor_jobs(hass: HomeAssistant, tmp_path: Path) -> None:
+    """Test executor jobs are timed only while profiling."""
+    assert await async_add_executor_job(hass, sum, NUMBERS) == sum(NUMBERS)
+
+    profiler = hass.data[DATA_PROFILER] = LUNMistoAirProfiler(1, tmp_path)
+    for _ in range(JOBS):
+        assert await async_add_executor_job(hass, sum, NUMBERS) == sum(NUMBERS)
+    # Failed jobs are timed as well
+    with pytest.raises(OSError, match="Job failed"):
+        await async_add_executor_job(hass, _fail)
+
+    summary = profiler.summary()
+    assert summary["executor_jobs"] == JOBS + 1
+    assert summary["executor_cpu_time"] >= 0
@@ -0,0 +1,74 @@
+"""Tests for recording and replaying LUN Misto Air responses."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import TYPE_CHECKING
+
+from homeassistant.util import dt as dt_util
+
+from custom_components.lun_misto_air.api import LUNMistoAirPriority
+from custom_components.lun_misto_air.health import LUNMistoAirHealth
+from custom_components.lun_misto_air.recording import (
+    LUNMistoAirRecorder,
+    LUNMistoAirReplaySource,
+)
+from custom_components.lun_misto_air.snapshot import build_snapshot
+
+from .common import make_records
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    import pytest
+    from homeassistant.core import HomeAssistant
+
+FRAMES = 3
+RECORDED_AT = dt_util.parse_datetime("2026-01-10T08:00:00+00:00")
+
+
+async def test_replay_fresh_as_recorded(hass: HomeAssistant, tmp_path: Path) -> None:
+    """Test replayed stations are as fresh as when they were recorded."""
+    path = tmp_path / "trace.jsonl.gz"
+    recorder = LUNMistoAirRecorder(hass, path)
+    for frame in range(2):
+        recorded_at = RECORDED_AT + frame * timedelta(minutes=10)
+        await recorder.async_record(recorded_at, make_records(3, updated=recorded_at))
+
+    source = LUNMistoAirReplaySource("replay", hass, path, speed=1)
+    for frame in range(3):
+        records = await source.async_fetch(LUNMistoAirPriority.REFRESH)
+        # The last response keeps being returned after the replay finished
+        assert source.captured_at == RECORDED_AT + min(frame, 1) * timedelta(minutes=10)
+
+        snapshot = build_snapshot(
+            records,
+            version=frame,
+            fetched_at=dt_util.utcnow(),
+            captured_at=source.captured_at,
+        )
+        assert all(
+            LUNMistoAirHealth.FRESH in health for health in snapshot.health.values()
+        )
+
+
+async def test_replay_truncated_archive(
+    hass: HomeAssistant,
+    tmp_path: Path,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test responses before a truncated append are still replayed."""
+    path = tmp_path / "trace.jsonl.gz"
+    recorder = LUNMistoAirRecorder(hass, path)
+    for frame in range(FRAMES):
+        recorded_at = RECORDED_AT + frame * timedelta(minutes=10)
+        await recorder.async_record(recorded_at, make_records(3, updated=recorded_at))
+    # Cut the last append short, as a crash while writing would
+    content = await hass.async_add_executor_job(path.read_bytes)
+    await hass.async_add_executor_job(path.write_bytes, content[:-10])
+
+    source = LUNMistoAirReplaySource("replay", hass, path, speed=1)
+    await source.async_fetch(LUNMistoAirPriority.REFRESH)
+
+    assert source.frame_count == FRAMES - 1
+    assert f"is damaged after {FRAMES - 1} responses" in caplog.text
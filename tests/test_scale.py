@@ -0,0 +1,192 @@
+"""Scaling of LUN Misto Air setup and refreshes with the number of stations."""
+
+from __future__ import annotations
+
+import threading
+import time
+from datetime import timedelta
+from typing import TYPE_CHECKING, Any, Self
+
+import pytest
+from homeassistant.config_entries import ConfigEntryState, ConfigSubentryData
+from homeassistant.const import CONF_NAME, EVENT_STATE_CHANGED
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.lun_misto_air.const import (
+    CONF_RATE_BURST,
+    CONF_STATION_NAME,
+    CONF_STATION_TYPE,
+    DOMAIN,
+    NAME,
+    STATION_TYPE_STATIC,
+    SUBENTRY_TYPE_STATION,
+    UPDATE_INTERVAL,
+)
+
+from .common import make_records
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+
+    from homeassistant.core import Event, HomeAssistant
+
+    from .conftest import FakeLUNMistoAirApi
+
+SUBENTRY_COUNTS = [10, 100, 500]
+CYCLES = 3
+
+# Loose ceilings, only meant to catch a design that stops scaling
+MAX_SETUP_TIME_PER_SUBENTRY = 0.05  # seconds
+MAX_LOOP_LAG_PER_SUBENTRY = 0.02  # seconds
+
+# How often the event loop is pinged while measuring its lag
+LAG_PROBE_INTERVAL = 0.005  # seconds
+
+
+class LoopLagProbe:
+    """Measure how long the event loop takes to run a callback from a thread."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the probe."""
+        self._loop = hass.loop
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="loop lag probe")
+        self.samples = 0
+        self.max_lag = 0.0
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            handled = threading.Event()
+            start = time.perf_counter()
+            self._loop.call_soon_threadsafe(handled.set)
+            # Setting the stop flag also releases a wait on a loop that is done
+            while not handled.wait(LAG_PROBE_INTERVAL):
+                if self._stop.is_set():
+                    return
+            self.max_lag = max(self.max_lag, time.perf_counter() - start)
+            self.samples += 1
+            self._stop.wait(LAG_PROBE_INTERVAL)
+
+    def __enter__(self) -> Self:
+        """Start probing."""
+        self._thread.start()
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        """Stop probing."""
+        self._stop.set()
+        self._thread.join()
+
+
+@pytest.fixture
+def state_writes(hass: HomeAssistant) -> Generator[list[str]]:
+    """Collect entity ids of sensor state writes."""
+    writes: list[str] = []
+
+    def _handle(event: Event) -> None:
+        if event.data["entity_id"].startswith("sensor."):
+            writes.append(event.data["entity_id"])
+
+    unsub = hass.bus.async_listen(EVENT_STATE_CHANGED, _handle)
+    yield writes
+    unsub()
+
+
+def _station_subentries(count: int) -> list[ConfigSubentryData]:
+    """Return subentries of static stations."""
+    return [
+        ConfigSubentryData(
+            data={
+                CONF_NAME: f"Station {number}",
+                CONF_STATION_TYPE: STATION_TYPE_STATIC,
+                CONF_STATION_NAME: f"Station {number}",
+            },
+            subentry_type=SUBENTRY_TYPE_STATION,
+            title=f"Station {number}",
+            unique_id=f"Station {number}",
+        )
+        for number in range(count)
+    ]
+
+
+@pytest.mark.usefixtures("enable_custom_integrations")
+@pytest.mark.parametrize("subentries", SUBENTRY_COUNTS)
+async def test_scale(
+    hass: HomeAssistant,
+    fake_api: FakeLUNMistoAirApi,
+    state_writes: list[str],
+    scale_report: list[dict[str, Any]],
+    subentries: int,
+) -> None:
+    """Test setup and refreshes of one entry with many station subentries."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title=NAME,
+        version=3,
+        data={},
+        # Enough tokens for the setup and every cycle, so none waits
+        options={CONF_RATE_BURST: CYCLES + 2},
+        subentries_data=_station_subentries(subentries),
+    )
+    entry.add_to_hass(hass)
+
+    with LoopLagProbe(hass) as probe:
+        start = time.perf_counter()
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        setup_time = time.perf_counter() - start
+    setup_lag = probe.max_lag
+
+    assert entry.state is ConfigEntryState.LOADED
+    setup_requests = fake_api.requests
+    entities = len(hass.states.async_entity_ids("sensor"))
+
+    # Time does not pass for the due check of station coordinators in tests,
+    # so readings fetched at one interval are delivered at the next one
+    cycle_requests: list[int] = []
+    cycle_writes: list[int] = []
+    with LoopLagProbe(hass) as probe:
+        now = dt_util.utcnow()
+        for cycle in range(1, CYCLES + 2):
+            requests, writes = fake_api.requests, len(state_writes)
+            fake_api.records = make_records(
+                len(fake_api.records),
+                updated=now + cycle * timedelta(minutes=UPDATE_INTERVAL),
+                seed=cycle,
+            )
+            async_fire_time_changed(
+                hass,
+                now + cycle * timedelta(minutes=UPDATE_INTERVAL, seconds=1),
+            )
+            await hass.async_block_till_done(wait_background_tasks=True)
+            cycle_requests.append(fake_api.requests - requests)
+            cycle_writes.append(len(state_writes) - writes)
+    refresh_lag = probe.max_lag
+
+    scale_report.append(
+        {
+            "subentries": subentries,
+            "entities": entities,
+            "setup_time": setup_time,
+            "setup_loop_lag": setup_lag,
+            "setup_requests": setup_requests,
+            "refresh_loop_lag": refresh_lag,
+            "requests_per_cycle": max(cycle_requests[:CYCLES]),
+            "writes_per_cycle": max(cycle_writes[1:]),
+        }
+    )
+
+    # All subentries share a single request, however many there are
+    assert setup_requests == 1
+    assert setup_time <= subentries * MAX_SETUP_TIME_PER_SUBENTRY
+    assert max(setup_lag, refresh_lag) <= subentries * MAX_LOOP_LAG_PER_SUBENTRY
+    assert cycle_requests[:CYCLES] == [1] * CYCLES
+    # Readings moving less than their deadband are not written
+    assert all(0 < writes <= entities for writes in cycle_writes[1:])
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
@@ -0,0 +1,38 @@
+"""Tests for LUN Misto Air sensors."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import TYPE_CHECKING
+
+import pytest
+from homeassistant.const import STATE_UNAVAILABLE
+from homeassistant.util import dt as dt_util
+
+from custom_components.lun_misto_air.const import ATTR_STALE, STALE_AFTER
+
+from .common import make_records
+from .conftest import STATION_COUNT, async_setup_station_entry
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from .conftest import FakeLUNMistoAirApi
+
+
+@pytest.mark.usefixtures("enable_custom_integrations")
+async def test_stale_station_keeps_readings(
+    hass: HomeAssistant,
+    fake_api: FakeLUNMistoAirApi,
+) -> None:
+    """Test sensors of a stale station stay available and are marked stale."""
+    fake_api.records = make_records(
+        STATION_COUNT,
+        updated=dt_util.utcnow() - timedelta(minutes=2 * STALE_AFTER),
+    )
+    await async_setup_station_entry(hass)
+
+    states = hass.states.async_all("sensor")
+    assert states
+    assert all(state.state != STATE_UNAVAILABLE for state in states)
+    assert all(state.attributes[ATTR_STALE] for state in states)
@@ -0,0 +1,87 @@
+"""Tests for LUN Misto Air services."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pytest
+from homeassistant.core import Context
+from homeassistant.exceptions import ServiceValidationError, Unauthorized
+
+from custom_components.lun_misto_air.const import (
+    ATTR_FILE,
+    DOMAIN,
+    SERVICE_PROFILE,
+)
+from custom_components.lun_misto_air.manager import async_get_manager
+
+if TYPE_CHECKING:
+    from homeassistant.auth.models import User
+    from homeassistant.core import HomeAssistant
+
+
+@pytest.mark.usefixtures("loaded_entry")
+async def test_profile_in_config_dir(hass: HomeAssistant) -> None:
+    """Test a profile is written relative to the configuration directory."""
+    await hass.services.async_call(
+        DOMAIN, SERVICE_PROFILE, {ATTR_FILE: "profiles/refresh.json"}, blocking=True
+    )
+
+    expected = await hass.async_add_executor_job(
+        Path(hass.config.path("profiles/refresh.json")).resolve
+    )
+    profiler = async_get_manager(hass).profiler
+    assert profiler is not None
+    assert profiler.path == expected
+
+
+@pytest.mark.usefixtures("loaded_entry")
+async def test_profile_in_allowed_dir(hass: HomeAssistant, tmp_path: Path) -> None:
+    """Test a profile can be written to an allowed external directory."""
+    hass.config.allowlist_external_dirs = {str(tmp_path)}
+
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_PROFILE,
+        {ATTR_FILE: str(tmp_path / "refresh.json")},
+        blocking=True,
+    )
+
+    profiler = async_get_manager(hass).profiler
+    assert profiler is not None
+    assert profiler.path == (tmp_path / "refresh.json").resolve()
+
+
+@pytest.mark.usefixtures("loaded_entry")
+@pytest.mark.parametrize(
+    "file",
+    ["../refresh.json", "profiles/../../refresh.json", "/etc/refresh.json"],
+)
+async def test_profile_outside_allowed_dirs(hass: HomeAssistant, file: str) -> None:
+    """Test a profile cannot be written outside the allowed directories."""
+    with pytest.raises(ServiceValidationError) as err:
+        await hass.services.async_call(
+            DOMAIN, SERVICE_PROFILE, {ATTR_FILE: file}, blocking=True
+        )
+
+    assert err.value.translation_key == "invalid_path"
+    assert async_get_manager(hass).profiler is None
+
+
+@pytest.mark.usefixtures("loaded_entry")
+async def test_profile_requires_admin(
+    hass: HomeAssistant,
+    hass_read_only_user: User,
+) -> None:
+    """Test only administrators can start profiling."""
+    with pytest.raises(Unauthorized):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_PROFILE,
+            {},
+            blocking=True,
+            context=Context(user_id=hass_read_only_user.id),
+        )
+
+    assert async_get_manager(hass).profiler is None
@@ -0,0 +1,75 @@
+"""Tests for LUN Misto Air snapshots and their diffs."""
+
+from __future__ import annotations
+
+from homeassistant.util import dt as dt_util
+
+from custom_components.lun_misto_air.snapshot import build_snapshot, diff_snapshots
+
+from .common import make_records
+
+
+def test_raw_records_dropped() -> None:
+    """Test only the station fields of records are kept."""
+    records = make_records(3)
+    records[0]["extra"] = "ignored"
+
+    snapshot = build_snapshot(records, version=1, fetched_at=dt_util.utcnow())
+
+    assert snapshot.stations.rows["Station 0"] == (
+        "Station 0",
+        records[0]["lat"],
+        records[0]["lng"],
+        "kyiv",
+        records[0]["aqi"],
+        records[0]["avgPm10"],
+        records[0]["avgPm25"],
+        records[0]["avgPm100"],
+        records[0]["updated"],
+        records[0]["temperature"],
+        records[0]["humidity"],
+        records[0]["pressure"],
+    )
+    assert snapshot.stations["Station 0"].aqi == records[0]["aqi"]
+
+
+def test_malformed_records_skipped() -> None:
+    """Test records missing station fields are skipped."""
+    records = make_records(3)
+    del records[1]["aqi"]
+
+    snapshot = build_snapshot(
+        [*records, "not a record"],
+        version=1,
+        fetched_at=dt_util.utcnow(),
+    )
+
+    assert list(snapshot.stations) == ["Station 0", "Station 2"]
+
+
+def test_diff_snapshots() -> None:
+    """Test diffs list added and removed stations and changed fields."""
+    fetched_at = dt_util.utcnow()
+    records = make_records(3)
+    previous = build_snapshot(records, version=1, fetched_at=fetched_at)
+
+    records = make_records(4)[1:]
+    records[0] = {**records[0], "aqi": records[0]["aqi"] + 1, "extra": "ignored"}
+    current = build_snapshot(records, version=2, fetched_at=fetched_at)
+
+    diff = diff_snapshots(previous, current)
+
+    assert diff.added == ["Station 3"]
+    assert diff.removed == ["Station 0"]
+    assert diff.changed == {"Station 1": {"aqi": records[0]["aqi"]}}
+    assert not diff.initial
+
+
+def test_diff_initial_snapshot() -> None:
+    """Test every station is added by the first snapshot."""
+    snapshot = build_snapshot(make_records(2), version=1, fetched_at=dt_util.utcnow())
+
+    diff = diff_snapshots(None, snapshot)
+
+    assert diff.added == ["Station 0", "Station 1"]
+    assert diff.initial
@@ -0,0 +1,94 @@
+"""Tests for LUN Misto Air HTTP views."""
+
+from __future__ import annotations
+
+from http import HTTPStatus
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+import pytest
+from aiohttp import hdrs
+
+from custom_components.lun_misto_air import views
+from custom_components.lun_misto_air.manager import async_get_manager
+from custom_components.lun_misto_air.views import (
+    LUNMistoAirStationsView,
+    accepts_gzip,
+)
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+    from pytest_homeassistant_custom_component.typing import ClientSessionGenerator
+
+    from custom_components.lun_misto_air.snapshot import LUNMistoAirSnapshot
+
+    from .conftest import FakeLUNMistoAirApi
+
+
+def _fail(_snapshot: LUNMistoAirSnapshot) -> None:
+    msg = "Serialization failed"
+    raise ValueError(msg)
+
+
+async def test_payload_after_failed_serialization(
+    hass: HomeAssistant,
+    fake_api: FakeLUNMistoAirApi,
+) -> None:
+    """Test a failed serialization is retried by the next request."""
+    manager = async_get_manager(hass)
+    snapshot = await manager.async_fetch()
+    view = LUNMistoAirStationsView(manager)
+
+    with (
+        patch.object(views, "_serialize", _fail),
+        pytest.raises(ValueError, match="Serialization failed"),
+    ):
+        await view._async_get_payload(hass, snapshot)  # noqa: SLF001
+
+    payload = await view._async_get_payload(hass, snapshot)  # noqa: SLF001
+    assert payload.version == snapshot.version
+    assert len(fake_api.records) == payload.body.count(b'"Feature"')
+
+
+@pytest.mark.parametrize(
+    ("accept_encoding", "expected"),
+    [
+        ("", False),
+        ("gzip", True),
+        ("br, gzip;q=0.5", True),
+        ("gzip;q=0", False),
+        ("gzip; q=0.000", False),
+        ("*", True),
+        ("*;q=0", False),
+        ("identity", False),
+        ("*, gzip;q=0", False),
+        ("X-GZIP", True),
+        ("gzip;q=invalid", False),
+    ],
+)
+def test_accepts_gzip(accept_encoding: str, expected: bool) -> None:  # noqa: FBT001
+    """Test Accept-Encoding values are parsed with their q-values."""
+    assert accepts_gzip(accept_encoding) is expected
+
+
+@pytest.mark.usefixtures("loaded_entry")
+async def test_if_none_match_any(
+    hass: HomeAssistant,
+    hass_client: ClientSessionGenerator,
+) -> None:
+    """Test any version satisfies an If-None-Match wildcard."""
+    client = await hass_client()
+
+    response = await client.get(
+        LUNMistoAirStationsView.url,
+        headers={hdrs.IF_NONE_MATCH: "*", hdrs.ACCEPT_ENCODING: "gzip;q=0"},
+    )
+    assert response.status == HTTPStatus.NOT_MODIFIED
+
+    response = await client.get(
+        LUNMistoAirStationsView.url,
+        headers={hdrs.ACCEPT_ENCODING: "gzip;q=0"},
+        auto_decompress=False,
+    )
+    assert response.status == HTTPStatus.OK
+    assert hdrs.CONTENT_ENCODING not in response.headers